@@ -0,0 +1,120 @@
+// Clientside versions of the filter-only assessment figures, which are drawn
+// from the grade rollups in the browser when CLIENTSIDE_FIGURES is set. Each
+// function mirrors its server-side counterpart in pages/assessment.py.
+
+const PERCENT_AXIS = {range: [0, 1.05], tickformat: ".0%"};
+
+function metricBars(names, series, axisTitle) {
+    return ["Average", "Median"].map((metric) => ({
+        type: "bar",
+        name: metric,
+        legendgroup: metric,
+        offsetgroup: metric,
+        x: names,
+        y: series[metric],
+        customdata: series["Count"].map((count) => [count]),
+        texttemplate: "%{y:.0%}",
+        textposition: "auto",
+        hovertemplate: `Metric=${metric}<br>${axisTitle}=%{x}<br>Percentage=%{y}<br>Count=%{customdata[0]}<extra></extra>`
+    }));
+}
+
+function percentLayout(rollups, title, axisTitle, extra) {
+    return {
+        template: rollups.template,
+        title: {text: title},
+        xaxis: {title: {text: axisTitle}},
+        yaxis: {title: {text: "Percentage"}, ...PERCENT_AXIS},
+        ...extra
+    };
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    assessment: {
+        renderGradeOverview: function (rollups, courseFilter) {
+            const course = rollups.courses[courseFilter];
+            const groups = course.groups;
+            return {
+                data: metricBars(groups["Assessment Group Name"], groups, "Assessment Group Name"),
+                layout: percentLayout(
+                    rollups,
+                    `Overview of Course Grades by Type for ${course.course}`,
+                    "Assessment Group Name",
+                    {barmode: "group", legend: {title: {text: "Metric"}}}
+                )
+            };
+        },
+
+        renderAssessmentCalculations: function (rollups, assessmentGroupFilter, courseFilter) {
+            const course = rollups.courses[courseFilter];
+            const assessments = course.assessments[assessmentGroupFilter];
+            return {
+                data: metricBars(assessments["Assessment Name"], assessments, "Assessment Name"),
+                layout: percentLayout(
+                    rollups,
+                    `Average and Median Grades for ${assessments.group} in ${course.course}`,
+                    "Assessment Name",
+                    {barmode: "group", legend: {title: {text: "Metric"}}}
+                )
+            };
+        },
+
+        renderMissingAssessments: function (rollups, assessmentGroupFilter, courseFilter) {
+            const course = rollups.courses[courseFilter];
+            const assessments = course.assessments[assessmentGroupFilter];
+            const layout = percentLayout(
+                rollups,
+                `Percent of Missing ${assessments.group} in ${course.course}`,
+                "Assessment Name"
+            );
+            layout.yaxis.title.text = "Percent Missing";
+            return {
+                data: [{
+                    type: "bar",
+                    x: assessments["Assessment Name"],
+                    y: assessments["Percent Missing"],
+                    customdata: assessments["Count"].map((count) => [count]),
+                    texttemplate: "%{y:.2%}",
+                    textposition: "auto",
+                    showlegend: false,
+                    hovertemplate: "Assessment Name=%{x}<br>Percent Missing=%{y}<br>Count=%{customdata[0]}<extra></extra>"
+                }],
+                layout: layout
+            };
+        },
+
+        renderAssessmentTrends: function (rollups, assessmentGroupFilter, courseFilter) {
+            const course = rollups.courses[courseFilter];
+            const semesters = course.semesters[assessmentGroupFilter];
+            const group = course.assessments[assessmentGroupFilter].group;
+            const names = rollups.assessmentOrder.filter(
+                (name) => semesters["Assessment Name"].includes(name)
+            );
+            const layout = percentLayout(
+                rollups,
+                `Average Grades for ${group} in ${course.course} by Semester`,
+                "Semester",
+                {legend: {title: {text: "Assessment Name"}}}
+            );
+            layout.xaxis.categoryorder = "array";
+            layout.xaxis.categoryarray = rollups.semesterOrder;
+            return {
+                data: names.map((name) => {
+                    const rows = semesters["Assessment Name"]
+                        .map((other, i) => other === name ? i : -1)
+                        .filter((i) => i >= 0);
+                    return {
+                        type: "scatter",
+                        mode: "lines+markers",
+                        name: name,
+                        legendgroup: name,
+                        x: rows.map((i) => semesters["Semester"][i]),
+                        y: rows.map((i) => semesters["Average"][i]),
+                        hovertemplate: `Assessment Name=${name}<br>Semester=%{x}<br>Percentage=%{y}<extra></extra>`
+                    };
+                }),
+                layout: layout
+            };
+        }
+    }
+});
@@ -0,0 +1,169 @@
+import functools
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter, OrderedDict
+
+from plotly.utils import PlotlyJSONEncoder
+
+from core.constants import *
+
+logger = logging.getLogger(__name__)
+
+# Rendered figures, keyed by a hash of (figure ID, callback inputs)
+_FIGURES: OrderedDict[str, dict] = OrderedDict()
+_FIGURES_LOCK = threading.Lock()
+_FIGURE_STATS = Counter(hits=0, disk_hits=0, misses=0)
+
+
+def _source_version() -> str:
+    """
+    Hashes the source code of the dashboard, so figures rendered by one 
+    deploy are never served by another one that draws them differently.
+
+    :return: the hash of every module in core and pages
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha1()
+    for path in sorted(glob.glob(os.path.join(root, "*", "*.py"))):
+        if os.path.basename(os.path.dirname(path)) in ("core", "pages"):
+            with open(path, "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()[:16]
+
+
+_CODE_VERSION = _source_version()
+
+
+def cache_figure(figure_id: str):
+    """
+    Decorates a figure render, so each combination of inputs is only 
+    rendered once. Since data stores hold versioned handles, the inputs 
+    already identify the version of the data, and new data naturally misses
+    the cache. The version of the code is part of the key as well, so a 
+    deploy misses it too. Rendered figures are kept as serialized plotly 
+    JSON in an in-process LRU cache of FIGURE_CACHE_SIZE figures. If 
+    FIGURE_CACHE_DIRECTORY is set, they are also written there, so every 
+    worker on the host can share them, up to FIGURE_CACHE_DISK_SIZE figures.
+
+    The decorated render returns the figure as a plotly JSON dict rather 
+    than a figure object. If the render is a callback, place this decorator
+    below @callback.
+
+    :param figure_id: the ID of the figure (e.g., ID_GRADE_OVERVIEW_FIG)
+    :return: the decorator
+    """
+    def decorator(render):
+        @functools.wraps(render)
+        def wrapper(*args):
+            key = hashlib.sha1(
+                json.dumps([_CODE_VERSION, figure_id, args], sort_keys=True, default=str).encode()
+            ).hexdigest()
+
+            # Check memory, then disk
+            with _FIGURES_LOCK:
+                if key in _FIGURES:
+                    _FIGURE_STATS["hits"] += 1
+                    _FIGURES.move_to_end(key)
+                    return _FIGURES[key]
+            figure = _read_figure(key)
+            outcome = "disk_hits" if figure is not None else "misses"
+            if figure is None:
+                serialized = json.dumps(render(*args), cls=PlotlyJSONEncoder)
+                _write_figure(key, serialized)
+                figure = json.loads(serialized)
+
+            with _FIGURES_LOCK:
+                _FIGURE_STATS[outcome] += 1
+                _FIGURES[key] = figure
+                while len(_FIGURES) > FIGURE_CACHE_SIZE:
+                    _FIGURES.popitem(last=False)
+            return figure
+        return wrapper
+    return decorator
+
+
+def _read_figure(key: str) -> dict | None:
+    """
+    Reads a rendered figure from the on-disk cache, if it's enabled. Reading
+    a figure marks it as recently used, so it's the last to be evicted.
+
+    :param key: the cache key of the figure
+    :return: the figure as plotly JSON, or None if it has not been cached
+    """
+    if not FIGURE_CACHE_DIRECTORY:
+        return None
+    path = os.path.join(FIGURE_CACHE_DIRECTORY, f"{key}.json")
+    try:
+        with open(path) as file:
+            figure = json.load(file)
+        os.utime(path)
+        return figure
+    except (OSError, ValueError):
+        return None
+
+
+def _write_figure(key: str, serialized: str) -> None:
+    """
+    Writes a rendered figure to the on-disk cache, if it's enabled. The file
+    is moved into place once written, so other workers never read a partial
+    figure. Once the cache holds more than FIGURE_CACHE_DISK_SIZE figures, 
+    the least recently used ones are removed.
+
+    :param key: the cache key of the figure
+    :param serialized: the figure as a plotly JSON string
+    """
+    if not FIGURE_CACHE_DIRECTORY:
+        return
+    path = os.path.join(FIGURE_CACHE_DIRECTORY, f"{key}.json")
+    try:
+        os.makedirs(FIGURE_CACHE_DIRECTORY, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=FIGURE_CACHE_DIRECTORY, suffix=".tmp", delete=False
+        ) as file:
+            file.write(serialized)
+        os.replace(file.name, path)
+    except OSError:
+        logger.exception("Failed to write %s", path)
+        return
+    _evict_figures()
+
+
+def _evict_figures() -> None:
+    """
+    Removes the least recently used figures from the on-disk cache until it
+    holds FIGURE_CACHE_DISK_SIZE figures. Other workers may be evicting at 
+    the same time, so figures that are already gone are skipped.
+    """
+    paths = glob.glob(os.path.join(FIGURE_CACHE_DIRECTORY, "*.json"))
+    if len(paths) <= FIGURE_CACHE_DISK_SIZE:
+        return
+    used = {}
+    for path in paths:
+        try:
+            used[path] = os.path.getmtime(path)
+        except OSError:
+            continue
+    for path in sorted(used, key=used.get)[:len(used) - FIGURE_CACHE_DISK_SIZE]:
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+
+
+def figure_cache_info() -> dict:
+    """
+    Reports how well the figure cache is doing.
+
+    :return: the memory hit, disk hit, and miss counts alongside the size
+    """
+    with _FIGURES_LOCK:
+        return {
+            **_FIGURE_STATS,
+            "size": len(_FIGURES),
+            "maxsize": FIGURE_CACHE_SIZE
+        }
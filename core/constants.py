@@ -1,4 +1,5 @@
-import pandas as pd
+import os
+
 import plotly.express as px
 
 # Data URLS
@@ -15,6 +16,34 @@ URL_SEI_QUESTIONS = "data/questions.csv"
 URL_SEI_INSTRUCTOR_SCORES = "data/instructor-scores.csv"
 URL_SEI_REPORTS = "data/reports.csv"
 URL_SEMESTERS = "data/semesters.csv"
+URL_SNAPSHOTS = "data/snapshots"
+URL_EXPORT = "export"
+URL_NLTK_DATA = "data/nltk"
+
+# Version of the merged dataset layout stored in snapshots; bump it whenever
+# a merge in core.data changes its output, so older snapshots are rebuilt
+SNAPSHOT_SCHEMA_VERSION = 3
+
+# Cache sizes
+DATASET_VERSIONS_KEPT = 2
+FIGURE_CACHE_SIZE = 256
+
+# Directory for sharing rendered figures across workers (disabled if unset),
+# along with the number of figures kept there
+FIGURE_CACHE_DIRECTORY = os.environ.get("FIGURE_CACHE_DIRECTORY")
+FIGURE_CACHE_DISK_SIZE = 4096
+
+# Number of submission rows read at a time when loading the grade data
+SUBMISSIONS_CHUNK_SIZE = 100_000
+
+# Number of threads used to load the datasets at startup
+DATASET_LOAD_WORKERS = 6
+
+# Number of seconds between checks for new data
+DATA_WATCH_INTERVAL = 30
+
+# Draw filter-only assessment figures in the browser (disabled if unset)
+CLIENTSIDE_FIGURES = bool(os.environ.get("CLIENTSIDE_FIGURES"))
 
 # Page constants
 HOME_PAGE_PATH = "/"
@@ -70,12 +99,32 @@ COLUMN_AVERAGE = "Average"
 COLUMN_COUNT = "Count"
 COLUMN_CUMULATIVE_ENROLLMENT_TOTAL = "Cumulative Enrollment Total"
 COLUMN_CLASSROOM = "Classroom"
+COLUMN_EXCUSED = "Excused"
 COLUMN_MEDIAN = "Median"
+COLUMN_MISSING = "Missing"
 COLUMN_PERCENTAGE = "Percentage"
 COLUMN_PERCENT_MISSING = "Percent Missing"
+COLUMN_QUESTION_SECTION = "Question Section"
+COLUMN_RESPONSE = "Response"
 COLUMN_SEMESTER = "Semester"
+COLUMN_SUBQUESTION = "Subquestion"
 COLUMN_WORD = "Word"
 
+# Declared column types per table; integer ID columns are also downcast
+TABLE_DTYPES = {
+    URL_COURSES: {
+        COLUMN_COURSE_DEPARTMENT: "category",
+        COLUMN_COURSE_NUMBER: str,
+        COLUMN_COURSE_TYPE: "category"
+    },
+    URL_COURSE_SECTIONS: {
+        COLUMN_EDUCATOR_TITLE: "category",
+        COLUMN_SECTION_BUILDING: "category",
+        COLUMN_SECTION_ROOM_NUMBER: str,
+        COLUMN_SECTION_START_TIME: str
+    }
+}
+
 # Data IDs
 ID_ASSIGNMENT_SURVEY_DATA = "assignment-survey-data"
 ID_COURSE_EVAL_DATA = "course-eval-data"
@@ -83,6 +132,87 @@ ID_EDUCATION_DATA = "education"
 ID_HISTORY_DATA = "history"
 ID_SEI_DATA = "sei-data"
 ID_SEI_COMMENTS_DATA = "sei-comments-data"
+ID_GRADE_ROLLUP_DATA = "grade-rollups"
+ID_STALE_DATA = "stale-data"
+
+# Declared column types per merged dataset; integer columns are also downcast
+DATASET_DTYPES = {
+    ID_EDUCATION_DATA: {
+        COLUMN_GRADE: "float32"
+    },
+    ID_SEI_DATA: {
+        COLUMN_SEMESTER_SEASON: "category"
+    }
+}
+
+# Joined columns of each merged dataset that nothing reads after loading
+DATASET_UNUSED_COLUMNS = {
+    ID_EDUCATION_DATA: [
+        COLUMN_SECTION_ID
+    ],
+    ID_SEI_DATA: [
+        COLUMN_REPORT_ID,
+        COLUMN_SECTION_ID,
+        COLUMN_COURSE_ID,
+        COLUMN_SECTION_BUILDING,
+        COLUMN_SECTION_ROOM_NUMBER,
+        COLUMN_SECTION_START_TIME,
+        COLUMN_ENROLLMENT_TOTAL,
+        COLUMN_EDUCATOR_TITLE,
+        COLUMN_COURSE_DEPARTMENT,
+        COLUMN_COURSE_NUMBER,
+        COLUMN_COURSE_NAME,
+        COLUMN_COURSE_TYPE
+    ]
+}
+
+# Source files of each dataset
+DATASET_SOURCES = {
+    ID_ASSIGNMENT_SURVEY_DATA: [
+        URL_ASSESSMENT_REVIEWS, 
+        URL_ASSESSMENTS, 
+        URL_ASSESSMENT_GROUPS
+    ],
+    ID_COURSE_EVAL_DATA: [
+        URL_EVALUATION_SURVEY_HISTORY
+    ],
+    ID_EDUCATION_DATA: [
+        URL_ASSESSMENT_SUBMISSIONS,
+        URL_COURSE_SECTIONS,
+        URL_ASSESSMENTS,
+        URL_ASSESSMENT_GROUPS,
+        URL_COURSES,
+        URL_SEMESTERS
+    ],
+    ID_HISTORY_DATA: [
+        URL_COURSE_SECTIONS, 
+        URL_COURSES, 
+        URL_SEMESTERS
+    ],
+    ID_SEI_DATA: [
+        URL_SEI_INSTRUCTOR_SCORES,
+        URL_SEI_REPORTS,
+        URL_COURSE_SECTIONS,
+        URL_COURSES,
+        URL_SEI_QUESTIONS,
+        URL_SEMESTERS,
+        URL_SEI_COHORT_SCORES
+    ],
+    ID_SEI_COMMENTS_DATA: [
+        URL_SEI_COMMENTS,
+        URL_SEI_REPORTS,
+        URL_COURSE_SECTIONS
+    ]
+}
+
+# Rollup IDs
+ID_GROUP_ROLLUP = "group-rollup"
+ID_ASSESSMENT_ROLLUP = "assessment-rollup"
+ID_SEMESTER_ROLLUP = "semester-rollup"
+ID_WORD_ROLLUP = "word-rollup"
+ID_TERM_ROLLUP = "term-rollup"
+ID_SEI_SCORE_ROLLUP = "sei-score-rollup"
+ID_RESPONSE_ROLLUP = "response-rollup"
 
 # Assessment figure IDs
 ID_ASSESSMENT_GROUP_TIME_FIG = "assessment-group-time-fig"
@@ -111,14 +241,9 @@ ID_COURSE_FILTER = "course-filter"
 ID_ASSESSMENT_GROUP_FILTER = "assessment-group-filter"
 ID_ASSESSMENT_FILTER = "assessment-filter"
 
-# Category orders constants
-ASSESSMENT_ORDER = pd.read_csv(URL_ASSESSMENTS)[COLUMN_ASSESSMENT_NAME]
+# Category orders constants (data-driven orders are loaded in core.data)
 COHORT_ORDER = ["Instructor", "Department", "College", "University"]
 METRIC_ORDER = [COLUMN_AVERAGE, COLUMN_MEDIAN]
-SEMESTER_ORDER = pd.read_csv(URL_SEMESTERS)[
-    [COLUMN_SEMESTER_SEASON, COLUMN_SEMESTER_YEAR]
-].astype(str).apply(" ".join, axis=1)
-QUESTION_ORDER = pd.read_csv(URL_SEI_QUESTIONS)[COLUMN_QUESTION]
 
 
 # TODO: remove these and rely on the data tables
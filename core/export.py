@@ -0,0 +1,479 @@
+"""
+Exports the whole dashboard as a static site that can be served without any
+Python workers (e.g., from a CDN). Every page in the page registry is rendered
+to HTML, and every figure is precomputed for every combination of dropdown
+values, so the dropdowns switch between figures in the browser. Export the
+site after updating the data:
+
+    python -m core.export [directory]
+
+The figures are computed by the page callbacks themselves, so the export
+always matches the live dashboard.
+"""
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import textwrap
+import time
+from html import escape
+
+import dash
+import dash_bootstrap_components as dbc
+from dash import no_update
+from dash.development.base_component import Component
+from plotly.offline import get_plotlyjs_version
+from plotly.utils import PlotlyJSONEncoder
+
+from core.constants import *
+
+logger = logging.getLogger(__name__)
+
+URL_PLOTLY_JS = f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"
+URL_MARKED_JS = "https://cdn.jsdelivr.net/npm/marked@12.0.2/marked.min.js"
+
+# Dash releases whose internals the callbacks are run through (see 
+# _registered_callbacks and _triggered_by); keep in step with pyproject.toml
+DASH_VERSIONS_SUPPORTED = ((2, 17), (2, 19))
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<link rel="icon" href="{root}assets/favicon.ico">
+<link rel="stylesheet" href="{stylesheet}">
+<link rel="stylesheet" href="{root}assets/themes.css">
+<script src="{plotly_js}"></script>
+<script src="{marked_js}"></script>
+</head>
+<body>
+<div class="container">
+<nav class="navbar navbar-dark bg-dark navbar-expand-md">
+<div class="container">
+<a href="https://jeremygrifski.com" style="text-decoration: none;">
+<div class="g-0 align-items-center row">
+<div class="col"><img src="{logo}" height="30px"></div>
+<div class="col"><span class="navbar-brand ms-2">The Educator Dashboard</span></div>
+</div>
+</a>
+<ul class="nav nav-pills">{links}</ul>
+</div>
+</nav>
+{content}
+</div>
+<script id="export-data" type="application/json">{data}</script>
+<script>{script}</script>
+</body>
+</html>
+"""
+
+# Moves between the precomputed states of a page as the dropdowns change,
+# redrawing only the figures that differ from the previous state
+PAGE_SCRIPT = """
+const page = JSON.parse(document.getElementById("export-data").textContent);
+const drawn = {};
+let state = page.initial;
+
+document.querySelectorAll(".export-markdown").forEach((element) => {
+    element.innerHTML = marked.parse(element.textContent);
+});
+
+function draw() {
+    const current = page.states[state];
+    Object.entries(current.dropdowns).forEach(([id, [options, value]]) => {
+        const select = document.getElementById(id);
+        select.replaceChildren(...options.map(
+            (option) => new Option(option.label, JSON.stringify(option.value))
+        ));
+        select.value = JSON.stringify(value);
+    });
+    Object.entries(current.figures).forEach(([id, index]) => {
+        if (drawn[id] !== index) {
+            const figure = page.figures[index];
+            Plotly.react(id, figure.data, figure.layout, {responsive: true});
+            drawn[id] = index;
+        }
+    });
+}
+
+Object.keys(page.states[state].dropdowns).forEach((id) => {
+    document.getElementById(id).addEventListener("change", (event) => {
+        state = page.states[state].next[id][event.target.value];
+        draw();
+    });
+});
+draw();
+"""
+
+
+def _to_json(value) -> str:
+    """
+    Encodes a value the same way the browser does with JSON.stringify, so
+    precomputed states can be looked up by the selected dropdown values.
+
+    :param value: any JSON-serializable value, including figures
+    :return: the compact JSON string
+    """
+    return json.dumps(value, cls=PlotlyJSONEncoder, separators=(",", ":"))
+
+
+def _walk(component):
+    """
+    Iterates over a component and all of its descendants.
+
+    :param component: the root of a layout
+    :return: a generator of components
+    """
+    if isinstance(component, Component):
+        yield component
+        component = getattr(component, "children", None)
+    if isinstance(component, (list, tuple)):
+        for child in component:
+            yield from _walk(child)
+    elif isinstance(component, Component):
+        yield from _walk(component)
+
+
+def _style(style: dict) -> str:
+    """
+    Converts a React style dictionary to an inline CSS declaration.
+
+    :param style: a style dictionary with camel case keys
+    :return: the CSS declaration
+    """
+    declarations = []
+    for name, value in style.items():
+        name = "".join(f"-{c.lower()}" if c.isupper() else c for c in name)
+        declarations.append(f"{name}: {value};")
+    return " ".join(declarations)
+
+
+def render_html(component) -> str:
+    """
+    Renders a layout to static HTML. HTML components map onto their tags,
+    graphs and dropdowns become empty placeholders that the page script
+    fills in, markdown is rendered in the browser, and stores are dropped.
+
+    :param component: the root of a layout
+    :return: the HTML
+    """
+    if component is None:
+        return ""
+    if isinstance(component, (list, tuple)):
+        return "".join(render_html(child) for child in component)
+    if not isinstance(component, Component):
+        return escape(str(component))
+
+    children = getattr(component, "children", None)
+    if component._namespace == "dash_core_components":
+        if component._type == "Graph":
+            return f'<div id="{escape(component.id)}"></div>'
+        if component._type == "Dropdown":
+            return f'<select id="{escape(component.id)}" class="form-select"></select>'
+        if component._type == "Markdown":
+            text = children if isinstance(children, str) else "\n".join(children)
+            return f'<div class="export-markdown">{escape(textwrap.dedent(text))}</div>'
+        if component._type == "Store":
+            return ""
+        return render_html(children)
+    if component._namespace != "dash_html_components":
+        return render_html(children)
+
+    attributes = ""
+    for prop, attribute in [("id", "id"), ("className", "class"), ("href", "href"), ("src", "src"), ("height", "height")]:
+        value = getattr(component, prop, None)
+        if value is not None:
+            attributes += f' {attribute}="{escape(str(value))}"'
+    style = getattr(component, "style", None)
+    if style:
+        attributes += f' style="{escape(_style(style))}"'
+    tag = component._type.lower()
+    return f"<{tag}{attributes}>{render_html(children)}</{tag}>"
+
+
+def _check_dash_version() -> None:
+    """
+    Makes sure the installed Dash release is one whose internals have been
+    checked, since they can change in any release.
+
+    :raises RuntimeError: if the installed Dash release is not supported
+    """
+    version = tuple(int(part) for part in dash.__version__.split(".")[:2])
+    oldest, newest = DASH_VERSIONS_SUPPORTED
+    if not oldest <= version < newest:
+        raise RuntimeError(
+            f"Running callbacks outside of a request relies on Dash internals, "
+            f"which have not been checked for Dash {dash.__version__}"
+        )
+
+
+def _registered_callbacks():
+    """
+    Iterates over the registered callbacks. Dash keeps them in private 
+    globals until the app serves its first request, when it moves them into
+    the app, and keeps the original functions behind its wrappers.
+
+    :return: a generator of (callback spec, output, function) triples
+    """
+    _check_dash_version()
+    from dash._callback import GLOBAL_CALLBACK_LIST, GLOBAL_CALLBACK_MAP
+
+    # Read the globals first, so callbacks being moved are found in the app
+    specs = list(GLOBAL_CALLBACK_LIST)
+    callback_map = dict(GLOBAL_CALLBACK_MAP)
+    app = dash.get_app()
+    specs += app._callback_list
+    callback_map.update(app.callback_map)
+
+    outputs = set()
+    for spec in specs:
+        if spec["output"] in outputs:
+            continue
+        outputs.add(spec["output"])
+        if spec["clientside_function"] is not None:
+            yield spec, None, None
+            continue
+        entry = callback_map[spec["output"]]
+        yield spec, entry["output"], entry["callback"].__wrapped__
+
+
+@contextlib.contextmanager
+def _triggered_by(triggered: list[dict]):
+    """
+    Sets the callback context (i.e., dash.ctx) for a callback run outside of
+    a request, so it can read the props that triggered it.
+
+    :param triggered: the triggering props as prop ID and value dictionaries
+    """
+    _check_dash_version()
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+
+    token = context_value.set(AttributeDict(triggered_inputs=triggered))
+    try:
+        yield
+    finally:
+        context_value.reset(token)
+
+
+def _page_callbacks(components: dict) -> list[dict]:
+    """
+    Finds the callbacks of a page, i.e., those whose outputs are all in the
+    page layout.
+
+    :param components: the components of the page keyed by ID
+    :return: a list of callbacks with their function, arguments and outputs
+    """
+    callbacks = []
+    for spec, outputs, function in _registered_callbacks():
+        # Clientside callbacks have no Python function to run (see export_site)
+        if function is None:
+            continue
+        outputs = outputs if isinstance(outputs, list) else [outputs]
+        outputs = [(output.component_id, output.component_property) for output in outputs]
+        if not all(component_id in components for component_id, _ in outputs):
+            continue
+        callbacks.append({
+            "function": function,
+            "inputs": [(arg["id"], arg["property"]) for arg in spec["inputs"]],
+            "arguments": [(arg["id"], arg["property"]) for arg in spec["inputs"] + spec["state"]],
+            "outputs": outputs
+        })
+    return callbacks
+
+
+def run_callbacks(callbacks: list[dict], props: dict, changed: list[tuple] | None) -> dict:
+    """
+    Runs the callbacks triggered by a change the way the Dash renderer does. 
+    A callback runs once the pending callbacks it depends on have run, and
+    every prop it updates triggers the callbacks downstream. On the initial 
+    call, every callback runs.
+
+    :param callbacks: the callbacks of the page
+    :param props: the current props keyed by (component ID, property)
+    :param changed: the props changed by the user, or None on the initial call
+    :return: the updated props
+    """
+    props = dict(props)
+    if changed is None:
+        pending = {i: [] for i in range(len(callbacks))}
+    else:
+        pending = {}
+        for i, c in enumerate(callbacks):
+            if set(changed) & set(c["inputs"]):
+                pending[i] = [prop for prop in changed if prop in c["inputs"]]
+
+    while pending:
+        ready = [
+            i for i in pending 
+            if not any(set(callbacks[j]["outputs"]) & set(callbacks[i]["inputs"]) for j in pending if j != i)
+        ]
+        i = ready[0] if ready else min(pending)
+        triggered = pending.pop(i)
+        c = callbacks[i]
+
+        # Callbacks read the triggering props through dash.ctx
+        with _triggered_by([
+            {"prop_id": f"{component_id}.{prop}", "value": props.get((component_id, prop))}
+            for component_id, prop in triggered
+        ]):
+            results = c["function"](*[props.get(arg) for arg in c["arguments"]])
+
+        if len(c["outputs"]) == 1:
+            results = [results]
+        for output, result in zip(c["outputs"], results):
+            if result is no_update:
+                continue
+            props[output] = result
+            for j, other in enumerate(callbacks):
+                if j != i and output in other["inputs"]:
+                    pending.setdefault(j, []).append(output)
+    return props
+
+
+def load_page(page: dict) -> tuple[Component, list[dict], dict, list[str]]:
+    """
+    Builds the layout of a page and finds what its callbacks work with: the 
+    callbacks themselves, the props they start from, and the dropdowns they 
+    populate.
+
+    :param page: the page entry from the page registry
+    :return: the layout, the callbacks, the initial props keyed by 
+        (component ID, property), and the dropdown IDs in layout order
+    """
+    layout = page["layout"]() if callable(page["layout"]) else page["layout"]
+    components = {c.id: c for c in _walk(layout) if isinstance(getattr(c, "id", None), str)}
+    callbacks = _page_callbacks(components)
+    props = {
+        (component_id, prop): getattr(components[component_id], prop, None)
+        for c in callbacks
+        for component_id, prop in c["arguments"]
+    }
+    props.update({
+        (c.id, "figure"): c.figure
+        for c in components.values()
+        if getattr(c, "figure", None) is not None
+    })
+
+    # Dropdowns populated by callbacks, in layout order
+    outputs = {output for c in callbacks for output in c["outputs"]}
+    dropdowns = [
+        component_id for component_id in components 
+        if (component_id, "options") in outputs and (component_id, "value") in outputs
+    ]
+    return layout, callbacks, props, dropdowns
+
+
+def export_page(page: dict) -> dict:
+    """
+    Renders a page and precomputes its figures. Starting from the initial
+    state of the page, every option of every dropdown is selected in turn 
+    by running the page callbacks, until every reachable state has been
+    visited. Each state records its dropdowns, its figures, and the state 
+    that selecting each option leads to. Figures are stored once and 
+    shared between states.
+
+    :param page: the page entry from the page registry
+    :return: the page HTML and the data for the page script
+    """
+    layout, callbacks, props, dropdowns = load_page(page)
+
+    figures = []
+    figure_indices = {}
+    states = {}
+
+    def visit(props: dict) -> str:
+        key = _to_json([props.get((dropdown, "value")) for dropdown in dropdowns])
+        if key in states:
+            return key
+        state = states[key] = {"dropdowns": {}, "figures": {}, "next": {}}
+        for (component_id, prop), value in props.items():
+            if prop == "figure" and value is not None:
+                figure = _to_json(value)
+                if figure not in figure_indices:
+                    figure_indices[figure] = len(figures)
+                    figures.append(value)
+                state["figures"][component_id] = figure_indices[figure]
+        for dropdown in dropdowns:
+            options = props[(dropdown, "options")]
+            value = props[(dropdown, "value")]
+            state["dropdowns"][dropdown] = [options, value]
+            state["next"][dropdown] = {
+                _to_json(option["value"]): key if option["value"] == value else visit(run_callbacks(
+                    callbacks, 
+                    {**props, (dropdown, "value"): option["value"]}, 
+                    [(dropdown, "value")]
+                ))
+                for option in options
+            }
+        return key
+
+    initial = visit(run_callbacks(callbacks, props, None))
+    return {
+        "html": render_html(layout),
+        "data": {
+            "initial": initial,
+            "states": states,
+            "figures": figures
+        }
+    }
+
+
+def export_site(directory: str = URL_EXPORT) -> None:
+    """
+    Exports every page of the dashboard to a directory, alongside the assets.
+    Each page is written to an index.html under its path, so the links work
+    on any static host.
+
+    :param directory: the directory to export to
+    :raises RuntimeError: if CLIENTSIDE_FIGURES is set
+    """
+    # Clientside figures are only drawn by the Dash renderer, so they would
+    # be exported empty
+    if CLIENTSIDE_FIGURES:
+        raise RuntimeError("Unset CLIENTSIDE_FIGURES to export the site")
+
+    # Imported here, since the pages register themselves with the app
+    import dashboard
+
+    shutil.copytree("assets", os.path.join(directory, "assets"), dirs_exist_ok=True)
+    for page in dash.page_registry.values():
+        start = time.perf_counter()
+        exported = export_page(page)
+        depth = page["path"].strip("/").count("/") + 1 if page["path"] != "/" else 0
+        root = "../" * depth
+        links = "".join(
+            f'<li class="nav-item"><a class="nav-link{" active" if other is page else ""}" '
+            f'href="{root}{other["path"].strip("/")}">{escape(other["name"])}</a></li>'
+            for other in dash.page_registry.values()
+        )
+        path = os.path.join(directory, page["path"].strip("/"), "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(PAGE_TEMPLATE.format(
+                title=escape(page["title"]),
+                root=root,
+                stylesheet=dbc.themes.SIMPLEX,
+                plotly_js=URL_PLOTLY_JS,
+                marked_js=URL_MARKED_JS,
+                logo=dashboard.TRC_LOGO,
+                links=links,
+                content=exported["html"],
+                # Keeps the JSON from closing the script tag early
+                data=_to_json(exported["data"]).replace("</", "<\\/"),
+                script=PAGE_SCRIPT
+            ))
+        logger.info(
+            "Exported %s in %.3fs",
+            path,
+            time.perf_counter() - start
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    export_site(*sys.argv[1:])
@@ -0,0 +1,164 @@
+"""
+Turns the SEI comments into word counts. The NLTK corpora are checked once
+at startup and downloaded into URL_NLTK_DATA if they are missing, so no
+request ever waits on the network. If they cannot be downloaded, the 
+dashboard still starts, just without word counts. Word counts are kept in 
+an incremental term index that is updated when the comments are loaded, 
+never while rendering a figure.
+"""
+import functools
+import logging
+import string
+import threading
+from collections import Counter
+
+import nltk
+import numpy as np
+import pandas as pd
+
+from core.constants import *
+
+logger = logging.getLogger(__name__)
+
+# NLTK resources mapped to the packages that provide them (NLTK 3.9 and up
+# tokenize with punkt_tab rather than punkt)
+NLTK_CORPORA = {
+    "tokenizers/punkt": "punkt",
+    "tokenizers/punkt_tab": "punkt_tab",
+    "corpora/stopwords": "stopwords"
+}
+
+# Word counts of the comments tokenized so far, kept across reloads: the row
+# hashes of the indexed comments, the counts per report, and the overall counts
+_TERM_INDEX_LOCK = threading.Lock()
+_TERM_INDEX = {
+    "hashes": np.empty(0, dtype=np.uint64),
+    "reports": {},
+    "all": Counter()
+}
+
+
+def ensure_corpora() -> None:
+    """
+    Makes sure the NLTK corpora needed for tokenizing comments are available,
+    downloading any missing ones into the local data directory. Meant to be
+    called once at startup.
+    """
+    if URL_NLTK_DATA not in nltk.data.path:
+        nltk.data.path.append(URL_NLTK_DATA)
+    for resource, package in NLTK_CORPORA.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            logger.info("Downloading %s to %s", package, URL_NLTK_DATA)
+            if not nltk.download(package, download_dir=URL_NLTK_DATA, quiet=True):
+                logger.warning("Failed to download %s, comments cannot be tokenized", package)
+
+
+@functools.cache
+def _excluded_words() -> frozenset[str]:
+    """
+    Collects the words that are left out of word counts: English stop words
+    and punctuation.
+
+    :return: the set of excluded words
+    """
+    # Imported here, since the corpus is only readable after ensure_corpora
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words("english")) | frozenset(string.punctuation)
+
+
+def _corpora_available() -> bool:
+    """
+    Checks whether comments can be tokenized, i.e., whether the tokenizer 
+    and the stop words this version of NLTK needs could be loaded.
+
+    :return: True if the corpora are available
+    """
+    try:
+        _excluded_words()
+        nltk.word_tokenize("")
+    except LookupError:
+        return False
+    return True
+
+
+def _tokenize(comment: str) -> list[str]:
+    """
+    Splits a comment into lowercase words, leaving out stop words, 
+    punctuation, and contractions.
+
+    :param comment: the comment to tokenize
+    :return: the remaining words in order
+    """
+    excluded = _excluded_words()
+    return [
+        word for word in nltk.word_tokenize(comment.lower()) 
+        if word not in excluded and "'" not in word
+    ]
+
+
+def index_comments(comments_df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Brings the term index up to date with the comments. Comments are only
+    ever appended, so as long as the comments indexed so far are unchanged, 
+    only the new ones are tokenized. Otherwise (e.g., a comment was edited), 
+    the index is rebuilt from scratch. If the NLTK corpora are missing, no 
+    comments are indexed and there are no word counts.
+
+    :param comments_df: the SEI comments along with their report IDs
+    :return: the word counts of all comments, most common first, and the 
+        word counts of every report
+    """
+    if not _corpora_available():
+        logger.warning("NLTK corpora are missing, leaving the SEI comments unindexed")
+        return (
+            pd.DataFrame(columns=[COLUMN_WORD, COLUMN_COUNT]),
+            pd.DataFrame(columns=[COLUMN_REPORT_ID, COLUMN_WORD, COLUMN_COUNT])
+        )
+
+    rows = comments_df[[COLUMN_REPORT_ID, COLUMN_COMMENT]]
+    hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    with _TERM_INDEX_LOCK:
+        indexed = len(_TERM_INDEX["hashes"])
+        if indexed > len(hashes) or not np.array_equal(hashes[:indexed], _TERM_INDEX["hashes"]):
+            logger.info("Comments were changed, rebuilding the term index")
+            _TERM_INDEX.update(hashes=hashes[:0], reports={}, all=Counter())
+            indexed = 0
+
+        # Tokenize the new comments only
+        for report_id, comment in rows.iloc[indexed:].itertuples(index=False):
+            if pd.isna(comment):
+                continue
+            words = _tokenize(comment)
+            _TERM_INDEX["reports"].setdefault(report_id, Counter()).update(words)
+            _TERM_INDEX["all"].update(words)
+        _TERM_INDEX["hashes"] = hashes
+        logger.info("Tokenized %d new comments", len(hashes) - indexed)
+
+        word_counts = pd.DataFrame(
+            list(_TERM_INDEX["all"].items()), 
+            columns=[COLUMN_WORD, COLUMN_COUNT]
+        )
+        term_counts = pd.DataFrame(
+            [
+                (report_id, word, count) 
+                for report_id, counts in _TERM_INDEX["reports"].items() 
+                for word, count in counts.items()
+            ],
+            columns=[COLUMN_REPORT_ID, COLUMN_WORD, COLUMN_COUNT]
+        )
+    return word_counts.sort_values(by=COLUMN_COUNT, ascending=False), term_counts
+
+
+def top_words(term_counts: pd.DataFrame, top_count: int) -> pd.DataFrame:
+    """
+    Totals the word counts of a set of reports (e.g., of a course or a 
+    semester) and picks the most common words.
+
+    :param term_counts: the word counts per report
+    :param top_count: the number of words to pick
+    :return: the most common words and their counts, most common first
+    """
+    word_counts = term_counts.groupby(COLUMN_WORD, sort=False)[COLUMN_COUNT].sum().reset_index()
+    return word_counts.sort_values(by=COLUMN_COUNT, ascending=False, kind="stable").head(top_count)
@@ -0,0 +1,112 @@
+"""
+Compiles the CSVs in the data directory into typed, columnar snapshots with 
+the merges from core.data already done. Snapshots are uncompressed Feather 
+files, so they can be memory-mapped. Build them after updating the data:
+
+    python -m core.snapshot
+
+Snapshots require pyarrow (the snapshots extra). Without it, or whenever a 
+snapshot is older than any of its source CSVs or was built for a different
+SNAPSHOT_SCHEMA_VERSION, the dashboard falls back to merging the CSVs.
+"""
+import logging
+import os
+import time
+
+import pandas as pd
+
+from core.constants import *
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+# Key of the schema version in the metadata of a snapshot
+SCHEMA_VERSION_KEY = b"snapshot_schema_version"
+
+
+def snapshot_path(dataset_id: str) -> str:
+    """
+    Computes the path of the snapshot of a dataset.
+
+    :param dataset_id: the ID of the dataset (e.g., ID_EDUCATION_DATA)
+    :return: the path of the snapshot file
+    """
+    return os.path.join(URL_SNAPSHOTS, f"{dataset_id}.feather")
+
+
+def read_snapshot(dataset_id: str, source_urls: list[str]) -> pd.DataFrame | None:
+    """
+    Reads the snapshot of a dataset by memory-mapping it. Nothing is returned
+    if pyarrow is missing, the snapshot has not been built, one of the 
+    source CSVs has changed since the snapshot was built, or the snapshot 
+    was built for a different SNAPSHOT_SCHEMA_VERSION.
+
+    :param dataset_id: the ID of the dataset (e.g., ID_EDUCATION_DATA)
+    :param source_urls: the paths of the CSVs the dataset is built from
+    :return: the dataset, or None if the CSVs have to be used instead
+    """
+    path = snapshot_path(dataset_id)
+    if feather is None or not os.path.exists(path):
+        return None
+    snapshot_mtime = os.stat(path).st_mtime_ns
+    if any(os.stat(url).st_mtime_ns > snapshot_mtime for url in source_urls):
+        logger.info("Snapshot %s is stale, falling back to CSVs", path)
+        return None
+    table = feather.read_table(path, memory_map=True)
+    schema_version = (table.schema.metadata or {}).get(SCHEMA_VERSION_KEY)
+    if schema_version != str(SNAPSHOT_SCHEMA_VERSION).encode():
+        logger.info("Snapshot %s has schema version %s, falling back to CSVs", path, schema_version)
+        return None
+    return table.to_pandas()
+
+
+def write_snapshot(dataset_id: str, df: pd.DataFrame) -> str:
+    """
+    Writes the snapshot of a dataset, tagged with SNAPSHOT_SCHEMA_VERSION. 
+    The file is written next to its final location and moved into place, so
+    readers never see a partial snapshot.
+
+    :param dataset_id: the ID of the dataset (e.g., ID_EDUCATION_DATA)
+    :param df: the merged dataset
+    :return: the path of the snapshot file
+    """
+    os.makedirs(URL_SNAPSHOTS, exist_ok=True)
+    path = snapshot_path(dataset_id)
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        SCHEMA_VERSION_KEY: str(SNAPSHOT_SCHEMA_VERSION).encode()
+    })
+    feather.write_feather(table, f"{path}.tmp", compression="uncompressed")
+    os.replace(f"{path}.tmp", path)
+    return path
+
+
+def build_snapshots() -> None:
+    """
+    Merges every dataset from its CSVs and writes its snapshot.
+    """
+    if feather is None:
+        raise RuntimeError("pyarrow is required to build snapshots")
+
+    # Imported here, since core.data reads snapshots through this module
+    from core.data import DATASET_MERGES
+
+    for dataset_id, merge in DATASET_MERGES.items():
+        start = time.perf_counter()
+        path = write_snapshot(dataset_id, merge())
+        logger.info(
+            "Built %s in %.3fs", 
+            path, 
+            time.perf_counter() - start
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_snapshots()
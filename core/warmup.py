@@ -0,0 +1,148 @@
+"""
+Warms up a worker before it takes traffic. Once the datasets are loaded,
+every page in the page registry is built and every combination of its
+dropdown values is selected in turn by running the page callbacks, the same
+way core.export explores a page. This fills the dataset, rollup, and figure
+caches, so the first visitors after a deploy or data refresh do not pay for
+them. A warm-up never renders more than FIGURE_CACHE_SIZE figures, since 
+any more would evict the ones it already rendered. Progress is reported by 
+warmup_status (see the /ready endpoint).
+"""
+import json
+import logging
+import threading
+import time
+
+import dash
+
+from core.cache import figure_cache_info
+from core.constants import *
+from core.export import load_page, run_callbacks
+
+logger = logging.getLogger(__name__)
+
+# Warm-up progress per page path, along with when the last warm-up started
+# and how many figures had been cached by then. Every warm-up is numbered, 
+# so one that has been superseded (e.g., by new data) stops instead of 
+# reporting progress for the latest one.
+_WARMUP_LOCK = threading.Lock()
+_WARMUP = {"generation": 0, "started": None, "figures": 0, "pages": {}}
+
+
+def _figures_cached() -> int:
+    """
+    Counts the figures put into the in-memory figure cache so far, whether
+    rendered or read from disk.
+
+    :return: the number of figures cached since startup
+    """
+    info = figure_cache_info()
+    return info["misses"] + info["disk_hits"]
+
+
+def _report(page: dict, generation: int, **progress) -> bool:
+    """
+    Records the warm-up progress of a page, unless the warm-up has been 
+    superseded.
+
+    :param page: the page entry from the page registry
+    :param generation: the number of the warm-up
+    :param progress: the progress to record (e.g., states=10)
+    :return: False if the warm-up has been superseded
+    """
+    with _WARMUP_LOCK:
+        if _WARMUP["generation"] != generation:
+            return False
+        _WARMUP["pages"][page["path"]].update(progress)
+        return True
+
+
+def warm_page(page: dict, generation: int) -> None:
+    """
+    Builds a page and runs its callbacks for every reachable combination of
+    dropdown values. Every state visited is counted in the warm-up progress.
+    The page is left alone as soon as a newer warm-up starts, and no more 
+    states are visited once the warm-up has cached FIGURE_CACHE_SIZE figures.
+
+    :param page: the page entry from the page registry
+    :param generation: the number of the warm-up (see start_warmup)
+    """
+    start = time.perf_counter()
+    _, callbacks, props, dropdowns = load_page(page)
+    visited = set()
+    pending = [(props, None)]
+    while pending:
+        # Stop before rendering more figures than the cache can hold
+        with _WARMUP_LOCK:
+            figures = _figures_cached() - _WARMUP["figures"]
+        if figures >= FIGURE_CACHE_SIZE:
+            logger.warning("Stopped warming up %s, the figure cache is full", page["path"])
+            _report(page, generation, truncated=True)
+            break
+
+        props, changed = pending.pop()
+        props = run_callbacks(callbacks, props, changed)
+        key = json.dumps([props.get((dropdown, "value")) for dropdown in dropdowns], default=str)
+        if key in visited:
+            continue
+        visited.add(key)
+        if not _report(page, generation, states=len(visited)):
+            logger.info("Stopped warming up %s, a newer warm-up started", page["path"])
+            return
+        for dropdown in dropdowns:
+            for option in props[(dropdown, "options")]:
+                if option["value"] != props[(dropdown, "value")]:
+                    pending.append((
+                        {**props, (dropdown, "value"): option["value"]},
+                        [(dropdown, "value")]
+                    ))
+    if _report(page, generation, ready=True, seconds=round(time.perf_counter() - start, 4)):
+        logger.info("Warmed up %s in %.3fs", page["path"], time.perf_counter() - start)
+
+
+def start_warmup() -> list[threading.Thread]:
+    """
+    Starts warming up every page in the page registry, each on its own
+    background thread. Meant to be called once the datasets are loaded and
+    again whenever they change.
+
+    :return: the warm-up threads
+    """
+    def warm(page: dict, generation: int):
+        try:
+            warm_page(page, generation)
+        except Exception:
+            logger.exception("Failed to warm up %s", page["path"])
+            _report(page, generation, ready=True, failed=True)
+
+    pages = list(dash.page_registry.values())
+    with _WARMUP_LOCK:
+        _WARMUP["generation"] += 1
+        _WARMUP["started"] = time.time()
+        _WARMUP["figures"] = _figures_cached()
+        _WARMUP["pages"] = {page["path"]: {"ready": False, "states": 0} for page in pages}
+        generation = _WARMUP["generation"]
+    threads = [
+        threading.Thread(target=warm, args=(page, generation), name=f"warmup-{page['module']}", daemon=True)
+        for page in pages
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def warmup_status() -> dict:
+    """
+    Reports the warm-up progress. The worker is ready once every page has
+    been warmed up.
+
+    :return: whether the worker is ready, along with the progress per page
+    """
+    with _WARMUP_LOCK:
+        pages = {path: dict(progress) for path, progress in _WARMUP["pages"].items()}
+        started = _WARMUP["started"]
+    return {
+        "ready": started is not None and all(progress["ready"] for progress in pages.values()),
+        "started": started,
+        "pages": pages
+    }
@@ -1,9 +1,45 @@
+import logging
+import time
+from collections import Counter
+
 import dash
 import dash_bootstrap_components as dbc
-from dash import html
+import pandas as pd
+from dash import Input, clientside_callback, dcc, html, set_props
+from flask import jsonify, request
+
+from core.cache import figure_cache_info
+from core.constants import ID_STALE_DATA
+from core.data import StaleDatasetError, dataset_report, load_datasets, table_report, watch_data
+from core.nlp import ensure_corpora
+from core.warmup import start_warmup, warmup_status
+
+# Dataframes in the dataset registry are shared by every callback in the
+# process, so copy-on-write guarantees that no callback can modify them
+# through a derived frame. This changes how pandas behaves for the whole
+# process, so it's set here by the app rather than by core.data.
+pd.set_option("mode.copy_on_write", True)
 
 TRC_LOGO = "https://avatars.githubusercontent.com/u/42280715"
 
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+startup_time = time.perf_counter()
+
+
+def reload_stale_page(err: Exception) -> None:
+    """
+    Handles errors raised by callbacks. A callback that was handed a retired
+    dataset version (e.g., by a page opened before the data changed) 
+    reloads the page, so it picks up the current data and filter values.
+
+    :param err: the error raised by the callback
+    """
+    if not isinstance(err, StaleDatasetError):
+        raise err
+    logger.info("Reloading a page with stale data: %s", err)
+    set_props(ID_STALE_DATA, {"data": True})
+
 
 app = dash.Dash(
     __name__,
@@ -18,9 +54,49 @@ app = dash.Dash(
     ],
     title="The Educator Dashboard",
     use_pages=True,
-    suppress_callback_exceptions=True
+    suppress_callback_exceptions=True,
+    on_error=reload_stale_page
 )
 server = app.server
+ensure_corpora()
+load_datasets()
+
+
+callback_requests = Counter()
+
+
+@server.before_request
+def count_callback_requests():
+    """
+    Counts the callback requests per output, so the number of round trips
+    caused by a filter change can be measured.
+    """
+    if request.path.endswith("/_dash-update-component"):
+        callback_requests[request.get_json()["output"]] += 1
+
+
+@server.route("/stats")
+def stats():
+    """
+    Exposes the internal cache counters, callback request counts, table 
+    catalog, and dataset footprints for monitoring.
+    """
+    return jsonify(
+        figure_cache=figure_cache_info(),
+        callback_requests=dict(callback_requests, total=sum(callback_requests.values())),
+        tables=table_report(),
+        datasets=dataset_report()
+    )
+
+
+@server.route("/ready")
+def ready():
+    """
+    Reports the warm-up progress of this worker. Responds with 503 until 
+    every page is warmed up, so load balancers can hold traffic until then.
+    """
+    status = warmup_status()
+    return jsonify(status), 200 if status["ready"] else 503
 
 
 logo = html.A(
@@ -63,9 +139,31 @@ app.layout = dbc.Container([
         color="dark",
         dark=True
     ),
-    dash.page_container
+    dash.page_container,
+    dcc.Store(id=ID_STALE_DATA)
 ])
 
+clientside_callback(
+    "function(stale) { if (stale) { window.location.reload(); } }",
+    Input(ID_STALE_DATA, "data"),
+    prevent_initial_call=True
+)
+
+logger.info("Dashboard started in %.3fs", time.perf_counter() - startup_time)
+
+
+def start_background_work() -> None:
+    """
+    Starts watching the data for changes and warming up the caches, both on
+    background threads, for the development server. Importing the app 
+    (e.g., to export it with core.export) starts no threads. Under gunicorn,
+    the master does this work itself in the foreground before forking the 
+    workers, so the hooks in gunicorn.conf.py take its place.
+    """
+    watch_data(on_change=start_warmup)
+    start_warmup()
+
 
 if __name__ == '__main__':
+    start_background_work()
     app.run_server(debug=True)
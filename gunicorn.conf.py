@@ -0,0 +1,56 @@
+"""
+Gunicorn settings for serving the dashboard:
+
+    gunicorn dashboard:server
+
+The app is preloaded, so the master process loads every dataset and warms
+up every cache once, before any worker is forked. Workers then share those
+pages with the master copy-on-write instead of each loading their own copy.
+Since the datasets are stored as compact numeric and categorical columns,
+most of those pages stay shared, and adding a worker costs little memory.
+
+The master also watches the data files. When they change, it sends itself
+SIGHUP, reloads and warms up the changed datasets once, and forks a fresh
+set of workers from the result while the old ones finish their requests.
+"""
+import multiprocessing
+import os
+import signal
+
+bind = "0.0.0.0:8000"
+workers = multiprocessing.cpu_count() * 2 + 1
+preload_app = True
+
+
+def _warm_up():
+    """
+    Warms up every cache in the foreground, so no warm-up threads are left
+    running when the workers are forked.
+    """
+    from core.warmup import start_warmup
+
+    for thread in start_warmup():
+        thread.join()
+
+
+def when_ready(server):
+    """
+    Warms up the master process once the app is preloaded, and starts
+    watching the data files. The watcher only signals the master, so the
+    data is always reloaded on the main thread, never while forking.
+    """
+    from core.data import watch_sources
+
+    _warm_up()
+    watch_sources(on_change=lambda: os.kill(os.getpid(), signal.SIGHUP))
+
+
+def on_reload(server):
+    """
+    Reloads the datasets whose files changed and warms up again, right
+    before the master forks the new workers on SIGHUP.
+    """
+    from core.data import load_datasets
+
+    load_datasets()
+    _warm_up()
@@ -1,5 +1,3 @@
-from io import StringIO
-from operator import itemgetter
 import re
 
 import dash
@@ -7,8 +5,9 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Input, Output, callback, dcc, html
+from dash import ClientsideFunction, Input, Output, callback, clientside_callback, ctx, dcc, html, no_update
 
+from core.cache import cache_figure
 from core.constants import *
 from core.data import *
 
@@ -49,60 +48,34 @@ def blank_plot() -> go.Figure:
 
         }
     )
-    
-def load_education_df(education_data):
-    return pd.read_json(StringIO(education_data), dtype={COLUMN_COURSE_NUMBER: str})
 
-# Graph Callbacks
+# Graph renders
 
-@callback(
-    Output(ID_GRADE_OVERVIEW_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_COURSE_FILTER, "value")
-)
+@cache_figure(ID_GRADE_OVERVIEW_FIG)
 def render_grade_overview_figure(
-    education_data: str, 
+    education_data: dict, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Plots an overview of the types of assessments that have been given in
     the current course. 
     
-    :param education_data: the jsonified education dataframe
+    :param education_data: the education data handle
     :param course_filter: the course ID
     :return: the grade overview figure object
     """
-    # Convert the data back into a dataframe
-    education_df = load_education_df(education_data)
+    # Look up the precomputed statistics on the server
+    rollup_df = resolve_rollup(education_data, ID_GROUP_ROLLUP, course_filter)
     
-    # Filter
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
-    education_df[COLUMN_TOTAL] = pd.to_numeric(education_df[COLUMN_TOTAL])
-    
-    # Precompute columns 
-    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_GRADE] / education_df[COLUMN_TOTAL]
-        
-    # Perform analysis
-    to_plot: pd.DataFrame = education_df.groupby(COLUMN_ASSESSMENT_GROUP_NAME)[COLUMN_PERCENTAGE].aggregate({
-        "mean", 
-        "median", 
-        "count"
-    })
-    to_plot = to_plot.rename(
-        columns={
-            "mean": COLUMN_AVERAGE, 
-            "median": COLUMN_MEDIAN,
-            "count": COLUMN_COUNT
-        }
-    )
+    # Select the metrics to plot
+    to_plot = rollup_df.set_index(COLUMN_ASSESSMENT_GROUP_NAME)[[
+        COLUMN_AVERAGE, 
+        COLUMN_MEDIAN, 
+        COLUMN_COUNT
+    ]].sort_index()
     
     # Helpful values
-    course_code = f'{education_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(education_df.iloc[0][COLUMN_COURSE_NUMBER])}'
+    course_code = f'{rollup_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(rollup_df.iloc[0][COLUMN_COURSE_NUMBER])}'
     
     # Plot figure
     grade_fig = go.Figure(layout=dict(template='plotly'))
@@ -128,66 +101,57 @@ def render_grade_overview_figure(
     return grade_fig
 
 
-@callback(
-    Output(ID_DETAILED_ASSESSMENT_GRADES_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value")
-)
+@cache_figure(ID_DETAILED_ASSESSMENT_GRADES_FIG)
 def render_assessment_calculations_figure(
-    education_data: str, 
+    education_data: dict, 
     assessment_group_filter: int, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Plots a breakdown of the averages and medians per assessment for a specific
     course and assessment group. 
     
-    :param education_data: the jsonified education dataframe
+    :param education_data: the education data handle
     :param course_filter: the course ID
     :param assessment_group_filter: the assessment group ID
     :return: the assessment calculations figure object
     """
-    # Convert the data back into a dataframe
-    education_df = load_education_df(education_data)
-    
-    # Filter
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
-    education_df[COLUMN_TOTAL] = pd.to_numeric(education_df[COLUMN_TOTAL])
-    
-    # Precompute columns 
-    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_GRADE] / education_df[COLUMN_TOTAL]
+    # Look up the precomputed statistics on the server
+    rollup_df = resolve_rollup(
+        education_data, 
+        ID_ASSESSMENT_ROLLUP, 
+        course_filter, 
+        assessment_group_filter
+    )
     
-    # Perform analysis
-    to_plot = education_df.groupby(COLUMN_ASSESSMENT_NAME)[COLUMN_PERCENTAGE].aggregate({"mean", "median", "count"})
+    # Select the metrics to plot
+    to_plot = rollup_df.set_index(COLUMN_ASSESSMENT_NAME)[[
+        COLUMN_AVERAGE, 
+        COLUMN_MEDIAN, 
+        COLUMN_COUNT
+    ]]
     
     # Helpful variables
-    course_code = f'{education_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(education_df.iloc[0][COLUMN_COURSE_NUMBER])}'
-    assignment_types = education_df.sort_values(COLUMN_ASSESSMENT_ID)[COLUMN_ASSESSMENT_NAME].unique()
-    assessment_group_name = education_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
+    course_code = f'{rollup_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(rollup_df.iloc[0][COLUMN_COURSE_NUMBER])}'
+    assignment_types = rollup_df[COLUMN_ASSESSMENT_NAME].unique()
+    assessment_group_name = rollup_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
         
     # Plot figure
     assignment_calculations_fig = go.Figure(layout=dict(template='plotly'))    
     assignment_calculations_fig = px.bar(
         to_plot,
         labels={
-            "value": "Percentage",
-            "variable": "Metric",
-            "count": "Count"
+            "value": COLUMN_PERCENTAGE,
+            "variable": "Metric"
         },
         barmode='group',
         text_auto=".0%",
         title=f"Average and Median Grades for {assessment_group_name} in {course_code}",
         category_orders={
-            COLUMN_ASSESSMENT_NAME: assignment_types
+            COLUMN_ASSESSMENT_NAME: assignment_types,
+            "variable": METRIC_ORDER
         },
-        hover_data=["count"]
+        hover_data=[COLUMN_COUNT]
     )
     assignment_calculations_fig.update_layout(
         yaxis_range=[0, 1.05],
@@ -197,50 +161,39 @@ def render_assessment_calculations_figure(
     return assignment_calculations_fig
 
 
-@callback(
-    Output(ID_MISSING_ASSESSMENT_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value")
-)
+@cache_figure(ID_MISSING_ASSESSMENT_FIG)
 def render_missing_assessments_figure(
-    education_data: str, 
+    education_data: dict, 
     assessment_group_filter: int, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Plots a breakdown of the averages and medians per assessment for a specific
     course and assessment group. 
     
-    :param education_data: the jsonified education dataframe
+    :param education_data: the education data handle
     :param course_filter: the course ID
     :param assessment_group_filter: the assessment group ID
     :return: the missing assessments figure object
     """
-    # Convert the data back into a dataframe
-    education_df = load_education_df(education_data)
-    
-    # Filter
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
+    # Look up the precomputed statistics on the server
+    rollup_df = resolve_rollup(
+        education_data, 
+        ID_ASSESSMENT_ROLLUP, 
+        course_filter, 
+        assessment_group_filter
+    )
     
     # Helpful values
-    course_code = f'{education_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(education_df.iloc[0][COLUMN_COURSE_NUMBER])}'
-    assignment_types = education_df.sort_values(COLUMN_ASSESSMENT_ID)[COLUMN_ASSESSMENT_NAME].unique()
-    assessment_group_name = education_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
+    course_code = f'{rollup_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(rollup_df.iloc[0][COLUMN_COURSE_NUMBER])}'
+    assignment_types = rollup_df[COLUMN_ASSESSMENT_NAME].unique()
+    assessment_group_name = rollup_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
     
-    # Helper function
-    def number_missing(series):
-        return len(series[series == 0])
-    
-    # Perform analysis
-    to_plot = education_df.groupby(COLUMN_ASSESSMENT_NAME)[COLUMN_GRADE].agg(["count", number_missing])
-    to_plot[COLUMN_PERCENT_MISSING] = to_plot["number_missing"] / to_plot["count"]
+    # Select the metrics to plot
+    to_plot = rollup_df.set_index(COLUMN_ASSESSMENT_NAME)[[
+        COLUMN_PERCENT_MISSING, 
+        COLUMN_COUNT
+    ]]
     
     # Plot figure
     missing_assignment_fig = go.Figure(layout=dict(template='plotly'))    
@@ -252,7 +205,7 @@ def render_missing_assessments_figure(
         category_orders={
             COLUMN_ASSESSMENT_NAME: assignment_types
         },
-        hover_data=["count"]
+        hover_data=[COLUMN_COUNT]
     )
     missing_assignment_fig.update_layout(
         yaxis_range=[0, 1.05],
@@ -261,55 +214,35 @@ def render_missing_assessments_figure(
     
     return missing_assignment_fig
 
-@callback(
-    Output(ID_ASSESSMENT_TRENDS_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value")
-) 
+@cache_figure(ID_ASSESSMENT_TRENDS_FIG)
 def render_assessment_trends_figure(
-    education_data: str, 
+    education_data: dict, 
     assessment_group_filter: int, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Plots the average grade for all assessments in an assessment group over time.
     
-    :param education_data: the jsonified education dataframe
+    :param education_data: the education data handle
     :param course_filter: the course ID
     :param assessment_group_filter: the assessment group ID
     :return: the grade overview figure object
     """
-    # Convert the data back into a dataframe
-    education_df = load_education_df(education_data)
-        
-    # Filter
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
-    education_df[COLUMN_TOTAL] = pd.to_numeric(education_df[COLUMN_TOTAL])
-    
-    # Precompute some columns
-    education_df[COLUMN_SEMESTER] = education_df[COLUMN_SEMESTER_SEASON] + " " + education_df[COLUMN_SEMESTER_YEAR].astype(str)
-    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_GRADE] / education_df[COLUMN_TOTAL]
+    # Look up the precomputed statistics on the server
+    rollup_df = resolve_rollup(
+        education_data, 
+        ID_SEMESTER_ROLLUP, 
+        course_filter, 
+        assessment_group_filter
+    )
     
     # Helpful values
-    course_code = f'{education_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(education_df.iloc[0][COLUMN_COURSE_NUMBER])}'
-    assessment_group_name = education_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
+    course_code = f'{rollup_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(rollup_df.iloc[0][COLUMN_COURSE_NUMBER])}'
+    assessment_group_name = rollup_df.iloc[0][COLUMN_ASSESSMENT_GROUP_NAME]
 
-    # Perform analysis
-    to_plot = education_df.groupby([
-        COLUMN_SEMESTER_ID, 
-        COLUMN_SEMESTER, 
-        COLUMN_ASSESSMENT_NAME
-    ]).agg({
-        COLUMN_PERCENTAGE: "mean"
-    }).reset_index()
-    to_plot = to_plot.sort_values(by=COLUMN_SEMESTER_ID)
+    # Select the metrics to plot
+    to_plot = rollup_df.rename(columns={COLUMN_AVERAGE: COLUMN_PERCENTAGE})
+    to_plot = to_plot.sort_values(by=COLUMN_SEMESTER_ID, kind="stable")
     
     # Plot figure
     trend_fig = go.Figure(layout=dict(template='plotly'))    
@@ -321,8 +254,8 @@ def render_assessment_trends_figure(
         markers=True,
         title=f"Average Grades for {assessment_group_name} in {course_code} by Semester",
         category_orders={
-            COLUMN_SEMESTER: SEMESTER_ORDER,
-            COLUMN_ASSESSMENT_NAME: ASSESSMENT_ORDER
+            COLUMN_SEMESTER: load_semester_order(),
+            COLUMN_ASSESSMENT_NAME: load_assessment_order()
         },
     ) 
     trend_fig.update_layout(
@@ -333,17 +266,44 @@ def render_assessment_trends_figure(
     return trend_fig
 
 
-@callback(
-    Output(ID_ASSESSMENT_GROUP_TIME_FIG, "figure"),
-    Input(ID_ASSIGNMENT_SURVEY_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value")
-) 
+# The figures above only depend on the dropdowns, so they can be drawn in the 
+# browser from the grade rollups instead of on the server
+if CLIENTSIDE_FIGURES:
+    clientside_callback(
+        ClientsideFunction("assessment", "renderGradeOverview"),
+        Output(ID_GRADE_OVERVIEW_FIG, "figure"),
+        Input(ID_GRADE_ROLLUP_DATA, "data"),
+        Input(ID_COURSE_FILTER, "value")
+    )
+    clientside_callback(
+        ClientsideFunction("assessment", "renderAssessmentCalculations"),
+        Output(ID_DETAILED_ASSESSMENT_GRADES_FIG, "figure"),
+        Input(ID_GRADE_ROLLUP_DATA, "data"),
+        Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
+        Input(ID_COURSE_FILTER, "value")
+    )
+    clientside_callback(
+        ClientsideFunction("assessment", "renderMissingAssessments"),
+        Output(ID_MISSING_ASSESSMENT_FIG, "figure"),
+        Input(ID_GRADE_ROLLUP_DATA, "data"),
+        Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
+        Input(ID_COURSE_FILTER, "value")
+    )
+    clientside_callback(
+        ClientsideFunction("assessment", "renderAssessmentTrends"),
+        Output(ID_ASSESSMENT_TRENDS_FIG, "figure"),
+        Input(ID_GRADE_ROLLUP_DATA, "data"),
+        Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
+        Input(ID_COURSE_FILTER, "value")
+    )
+
+
+@cache_figure(ID_ASSESSMENT_GROUP_TIME_FIG)
 def render_assessment_times_figure(
-    assignment_survey_data: str, 
+    assignment_survey_data: dict, 
     assessment_group_filter: int, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Creates a figure of the average and median time spent on each assignment.
     
@@ -351,12 +311,10 @@ def render_assessment_times_figure(
     :param assignment_group_filter: the assignment type (i.e., Homework or Project)
     :param course_filter: the course for which to create the time figure (e.g., CSE 2221: Software 1)
     """
-    # Convert the data back into a dataframe
-    assignment_survey_df = pd.read_json(StringIO(assignment_survey_data))
+    # Look up the dataframe on the server
+    assignment_survey_df = resolve_slice(assignment_survey_data, course_filter, assessment_group_filter)
         
     # Filter
-    assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_COURSE_ID] == course_filter]
-    assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
     assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_TIME_TAKEN].notnull()]
     
     # Exit early
@@ -396,19 +354,13 @@ def render_assessment_times_figure(
     return time_fig
 
 
-@callback(
-    Output(ID_VALUE_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_ASSIGNMENT_SURVEY_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value")
-) 
+@cache_figure(ID_VALUE_FIG)
 def render_value_figure(
-    education_data: str, 
-    assignment_survey_data: str, 
+    education_data: dict, 
+    assignment_survey_data: dict, 
     assessment_group_filter: int, 
     course_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Creates a figure of expected amount of points a student could get for an
     hour of their time. 
@@ -417,30 +369,18 @@ def render_value_figure(
     :param assignment_group_filter: the assignment type (i.e., Homework or Project)
     :param course_filter: the course for which to create the time figure (e.g., CSE 2221: Software 1)
     """
-    # Convert the data back into a dataframe
-    assignment_survey_df = pd.read_json(StringIO(assignment_survey_data))
-    education_df = load_education_df(education_data)
+    # Look up the dataframe on the server
+    assignment_survey_df = resolve_slice(assignment_survey_data, course_filter, assessment_group_filter)
+    education_df = resolve_slice(education_data, course_filter, assessment_group_filter)
         
     # Filter
-    assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_COURSE_ID] == course_filter]
-    assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
     assignment_survey_df = assignment_survey_df[assignment_survey_df[COLUMN_TIME_TAKEN].notnull()]
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
+    education_df = education_df[education_df[COLUMN_PERCENTAGE].notna()]
     
     # Exit early
     if len(assignment_survey_df) == 0:
         return blank_plot()
     
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
-    education_df[COLUMN_TOTAL] = pd.to_numeric(education_df[COLUMN_TOTAL])
-        
-    # Precompute columns 
-    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_GRADE] / education_df[COLUMN_TOTAL]
-  
     # Helpful variables
     assessment_group = assignment_survey_df[assignment_survey_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter].iloc[0][COLUMN_ASSESSMENT_GROUP_NAME] 
     
@@ -453,14 +393,11 @@ def render_value_figure(
     })
     to_plot_survey.columns = to_plot_survey.columns.map(' '.join)
     to_plot_survey = to_plot_survey.reset_index()
-    to_plot_scores = education_df.groupby([
-        COLUMN_ASSESSMENT_NAME, 
-        COLUMN_ASSESSMENT_ID
-    ]).agg({
+    to_plot_scores = education_df.groupby(COLUMN_ASSESSMENT_ID).agg({
         COLUMN_PERCENTAGE: ["mean", "median", "count"]
     })
     to_plot_scores.columns = to_plot_scores.columns.map(' '.join)
-    to_plot_scores = to_plot_scores.reset_index()
+    to_plot_scores = join_dimensions(education_data, to_plot_scores.reset_index(), COLUMN_ASSESSMENT_NAME)
     to_plot = pd.merge(to_plot_scores, to_plot_survey, on=[COLUMN_ASSESSMENT_ID, COLUMN_ASSESSMENT_NAME])
     to_plot["Median % Earned Per Hour of Work"] = to_plot["Percentage median"] / to_plot["Time Taken median"]
     to_plot = to_plot.sort_values(COLUMN_ASSESSMENT_ID)
@@ -486,48 +423,46 @@ def render_value_figure(
     return value_fig
 
 
-@callback(
-    Output(ID_GRADE_DISTRIBUTION_FIG, "figure"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_COURSE_FILTER, "value"),
-    Input(ID_ASSESSMENT_FILTER, "value")
-)
+@cache_figure(ID_GRADE_DISTRIBUTION_FIG)
 def render_grade_distribution_figure(
-    education_data: str, 
+    education_data: dict, 
     assessment_group_filter: int, 
     course_filter: int, 
     assessment_filter: int
-) -> go.Figure:
+) -> dict:
     """
     Plots the average grade for all assessments in an assessment group over time.
     
-    :param education_data: the jsonified education dataframe
+    :param education_data: the education data handle
     :param course_filter: the course ID
     :param assessment_group_filter: the assessment group ID
     :return: the grade overview figure object
     """
-    # Convert the data back into a dataframe
-    education_df = load_education_df(education_data)
+    # Look up the dataframe on the server
+    education_df = resolve_slice(
+        education_data, 
+        course_filter, 
+        assessment_group_filter, 
+        assessment_filter
+    )
         
-    # Filter
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_ID] == assessment_filter]
-    education_df = education_df[education_df[COLUMN_GRADE] != "EX"]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    
-    # Type cast
-    education_df[COLUMN_GRADE] = pd.to_numeric(education_df[COLUMN_GRADE])
-    education_df[COLUMN_TOTAL] = pd.to_numeric(education_df[COLUMN_TOTAL])
+    # Filter and label
+    education_df = education_df[education_df[COLUMN_PERCENTAGE].notna()]
+    education_df = join_dimensions(
+        education_data, 
+        education_df, 
+        COLUMN_COURSE_DEPARTMENT, 
+        COLUMN_COURSE_NUMBER, 
+        COLUMN_ASSESSMENT_NAME, 
+        COLUMN_SEMESTER
+    )
     
-    # Precompute some columns
-    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_GRADE] / education_df[COLUMN_TOTAL] * 100
-    education_df[COLUMN_SEMESTER] = education_df[COLUMN_SEMESTER_SEASON] + " " + education_df[COLUMN_SEMESTER_YEAR].astype(str)
+    # Scale percentages for the histogram
+    education_df[COLUMN_PERCENTAGE] = education_df[COLUMN_PERCENTAGE] * 100
     
     # Helpful values
     course_code = f'{education_df.iloc[0][COLUMN_COURSE_DEPARTMENT]} {str(education_df.iloc[0][COLUMN_COURSE_NUMBER])}'
-    semesters_in_order = [s for s in SEMESTER_ORDER if s in education_df[COLUMN_SEMESTER].unique()]
+    semesters_in_order = education_df[COLUMN_SEMESTER].cat.remove_unused_categories().cat.categories
     assessment_name = education_df.iloc[0][COLUMN_ASSESSMENT_NAME]
 
     # Plot figure
@@ -550,81 +485,46 @@ def render_grade_distribution_figure(
     
     return distribution_fig
 
-# Dropdown callbacks
+# Dropdown options
 
-@callback(
-    Output(ID_COURSE_FILTER, "options"),
-    Output(ID_COURSE_FILTER, "value"),
-    Input(ID_EDUCATION_DATA, "data")
-)
 def update_dropdown_course_filter(
-    education_data: str
+    education_data: dict
 ) -> tuple[list[dict], int]:
     """
-    A callback for populating the course dropdown. 
+    Computes the options for the course dropdown. 
     The labels in the dropdown are meant to be descriptive.
     The values are Course IDs, which can be used for filtering. 
     
     :param education_data: the education data
     :return: the options and start value for a dropdown
     """
-    education_df = load_education_df(education_data)
-    course_ids = education_df[COLUMN_COURSE_ID].unique()
-    options = []
-    for course_id in course_ids:
-        course_data = education_df[education_df[COLUMN_COURSE_ID] == course_id].iloc[0]
-        label = f"{course_data[COLUMN_COURSE_DEPARTMENT]} {course_data[COLUMN_COURSE_NUMBER]}"
-        value = course_id
-        options.append({"label": label, "value": value})
-    options.sort(key=itemgetter("label"))
-    return options, options[0]["value"]
+    options = resolve_lookup(education_data, ID_COURSE_FILTER)
+    return options, options[0]["value"] if options else None
 
 
-@callback(
-    Output(ID_ASSESSMENT_GROUP_FILTER, "options"),
-    Output(ID_ASSESSMENT_GROUP_FILTER, "value"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_COURSE_FILTER, "value")
-)
 def update_dropdown_assessment_group_filter(
-    education_data: str, 
+    education_data: dict, 
     course_filter: int
 ) -> tuple[list[dict], int]:
     """
-    A callback for populating the assessment group dropdown.
+    Computes the options for the assessment group dropdown.
     The labels and values are the same. 
     
     :param education_data: the education data
     :param course_filter: the current course
     :return: the options and start value for a dropdown
     """
-    education_df = load_education_df(education_data)
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    assessment_group_ids = education_df[COLUMN_ASSESSMENT_GROUP_ID].unique()
-    options = []
-    for assessment_group_id in assessment_group_ids:
-        assessment_group_data = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_id].iloc[0]
-        label = f"{assessment_group_data[COLUMN_ASSESSMENT_GROUP_NAME]} ({assessment_group_data[COLUMN_ASSESSMENT_GROUP_WEIGHT]}% Weight)"
-        value = assessment_group_id
-        options.append({"label": label, "value": value})
-    options.sort(key=lambda x: x["label"])
-    return options, options[0]["value"]
+    options = resolve_lookup(education_data, ID_ASSESSMENT_GROUP_FILTER, course_filter)
+    return options, options[0]["value"] if options else None
 
 
-@callback(
-    Output(ID_ASSESSMENT_FILTER, "options"),
-    Output(ID_ASSESSMENT_FILTER, "value"),
-    Input(ID_EDUCATION_DATA, "data"),
-    Input(ID_COURSE_FILTER, "value"),
-    Input(ID_ASSESSMENT_GROUP_FILTER, "value")
-)
 def update_dropdown_assessment_filter(
-    education_data: str, 
+    education_data: dict, 
     course_filter: int, 
     assessment_group_filter: int
 ) -> tuple[list[dict], int]:
     """
-    A callback for populating the assessment group dropdown.
+    Computes the options for the assessment dropdown.
     The labels and values are the same. 
     
     :param: the education data
@@ -632,147 +532,224 @@ def update_dropdown_assessment_filter(
     :param assessment_group_filter: the current assessment group
     :return: the options and start value for a dropdown
     """
-    education_df = load_education_df(education_data)
-    education_df = education_df[education_df[COLUMN_COURSE_ID] == course_filter]
-    education_df = education_df[education_df[COLUMN_ASSESSMENT_GROUP_ID] == assessment_group_filter]
-    education_df = education_df[education_df[COLUMN_TOTAL] != 0]
-    assessment_ids = education_df[COLUMN_ASSESSMENT_ID].unique()
-    options = []
-    for assessment_id in assessment_ids:
-        totals = education_df[education_df[COLUMN_ASSESSMENT_ID] == assessment_id][COLUMN_TOTAL].unique()
-        points = f"{totals[0]} Points" if len(totals) == 1 else "Varies"
-        assessment_id_data = education_df[education_df[COLUMN_ASSESSMENT_ID] == assessment_id].iloc[0]
-        assessment_name: str = assessment_id_data[COLUMN_ASSESSMENT_NAME]
-        label = f"{assessment_name} ({points})"
-        value = assessment_id
-        options.append({"label": label, "value": value})
-    options.sort(key=itemgetter("label"))
-    return options, options[0]["value"]
-
-
-layout = html.Div([
-    dbc.Navbar(
-        dbc.Container(
-            [
-                dcc.Dropdown(id=ID_COURSE_FILTER),
-                dcc.Dropdown(id=ID_ASSESSMENT_GROUP_FILTER),
-                dcc.Dropdown(id=ID_ASSESSMENT_FILTER)
-            ]
+    options = resolve_lookup(education_data, ID_ASSESSMENT_FILTER, course_filter, assessment_group_filter)
+    return options, options[0]["value"] if options else None
+
+
+# Page callback
+
+# Filters in the order they narrow down the data; changing one resets the rest
+ASSESSMENT_FILTERS = [ID_COURSE_FILTER, ID_ASSESSMENT_GROUP_FILTER, ID_ASSESSMENT_FILTER]
+
+# Figures rendered on the server (the rest are drawn in the browser)
+SERVER_FIGURES = [
+    *([] if CLIENTSIDE_FIGURES else [
+        ID_GRADE_OVERVIEW_FIG,
+        ID_DETAILED_ASSESSMENT_GRADES_FIG,
+        ID_MISSING_ASSESSMENT_FIG,
+        ID_ASSESSMENT_TRENDS_FIG
+    ]),
+    ID_ASSESSMENT_GROUP_TIME_FIG,
+    ID_VALUE_FIG,
+    ID_GRADE_DISTRIBUTION_FIG
+]
+
+
+@callback(
+    *[Output(filter_id, prop) for filter_id in ASSESSMENT_FILTERS for prop in ("options", "value")],
+    *[Output(figure_id, "figure") for figure_id in SERVER_FIGURES],
+    Input(ID_EDUCATION_DATA, "data"),
+    Input(ID_ASSIGNMENT_SURVEY_DATA, "data"),
+    *[Input(filter_id, "value") for filter_id in ASSESSMENT_FILTERS]
+)
+def update_assessment_page(
+    education_data: dict,
+    assignment_survey_data: dict,
+    course_filter: int,
+    assessment_group_filter: int,
+    assessment_filter: int
+) -> list:
+    """
+    A single callback for the whole assessment page. Changing a filter 
+    resets the filters after it and rerenders only the figures that depend 
+    on a filter that changed, all in one request. Everything else is left
+    as is.
+
+    :param education_data: the education data handle
+    :param assignment_survey_data: the assignment survey data handle
+    :param course_filter: the course ID
+    :param assessment_group_filter: the assessment group ID
+    :param assessment_filter: the assessment ID
+    :return: the options and value of every filter followed by every figure
+    """
+    # Everything from the changed filter on has to be updated
+    if ctx.triggered_id in ASSESSMENT_FILTERS:
+        changed = ASSESSMENT_FILTERS.index(ctx.triggered_id) + 1
+    else:
+        changed = 0
+    updates = {}
+
+    # Refresh the filters after the changed one
+    if changed <= 0:
+        options, course_filter = update_dropdown_course_filter(education_data)
+        updates[ID_COURSE_FILTER] = [options, course_filter]
+    if changed <= 1:
+        options, assessment_group_filter = update_dropdown_assessment_group_filter(education_data, course_filter)
+        updates[ID_ASSESSMENT_GROUP_FILTER] = [options, assessment_group_filter]
+    if changed <= 2:
+        options, assessment_filter = update_dropdown_assessment_filter(education_data, course_filter, assessment_group_filter)
+        updates[ID_ASSESSMENT_FILTER] = [options, assessment_filter]
+
+    # Render the figures of the changed filters
+    if changed <= 1 and ID_GRADE_OVERVIEW_FIG in SERVER_FIGURES:
+        updates[ID_GRADE_OVERVIEW_FIG] = render_grade_overview_figure(education_data, course_filter)
+    if changed <= 2 and ID_DETAILED_ASSESSMENT_GRADES_FIG in SERVER_FIGURES:
+        updates[ID_DETAILED_ASSESSMENT_GRADES_FIG] = render_assessment_calculations_figure(education_data, assessment_group_filter, course_filter)
+        updates[ID_MISSING_ASSESSMENT_FIG] = render_missing_assessments_figure(education_data, assessment_group_filter, course_filter)
+        updates[ID_ASSESSMENT_TRENDS_FIG] = render_assessment_trends_figure(education_data, assessment_group_filter, course_filter)
+    if changed <= 2:
+        updates[ID_ASSESSMENT_GROUP_TIME_FIG] = render_assessment_times_figure(assignment_survey_data, assessment_group_filter, course_filter)
+        updates[ID_VALUE_FIG] = render_value_figure(education_data, assignment_survey_data, assessment_group_filter, course_filter)
+    updates[ID_GRADE_DISTRIBUTION_FIG] = render_grade_distribution_figure(education_data, assessment_group_filter, course_filter, assessment_filter)
+
+    return [
+        *[value for filter_id in ASSESSMENT_FILTERS for value in updates.get(filter_id, [no_update, no_update])],
+        *[updates.get(figure_id, no_update) for figure_id in SERVER_FIGURES]
+    ]
+
+
+def layout(**kwargs) -> html.Div:
+    """
+    Builds the assessment page on every visit. The data is loaded on first use and 
+    reloaded whenever the underlying CSVs change, so nothing is loaded when 
+    the page is imported.
+
+    :return: the page layout
+    """
+    return html.Div([
+        dbc.Navbar(
+            dbc.Container(
+                [
+                    dcc.Dropdown(id=ID_COURSE_FILTER),
+                    dcc.Dropdown(id=ID_ASSESSMENT_GROUP_FILTER),
+                    dcc.Dropdown(id=ID_ASSESSMENT_FILTER)
+                ]
+            ),
+            color="dark",
+            dark=True,
+            sticky="top"
+        ),
+        html.H1("Assessment"),
+        html.P(
+            """
+            Since I began teaching in 2018, I've kept a lot of data about the
+            assessment of students. The goal of this page is to give you an overview 
+            of the way I've assessed students over the years. To browse a course, 
+            use the first dropdown at the top of the screen. All of the following 
+            plots will regenerate for you.  
+            """
+        ),
+        html.H2("Course Overview"),
+        html.P(
+            """
+            To kick things off, here's a plot of the average and median grades
+            grouped by assessment type (e.g., projects, homework, labs, etc.).
+            This should give you an overview of the types of assessments I've
+            used in my classes. Note: all of the assessments on this
+            page are averaged to include the missing assignments as well as all
+            submissions, which almost certainly lowers the overall averages.
+            Likewise, some averages, such as exams, are actually inflated due to 
+            grade replacement. Future work will be done to show this nuance in more 
+            detail.
+            """  
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_GRADE_OVERVIEW_FIG)],
+            type="graph"
+        ),
+        html.H2("Assessment Group Breakdown"),
+        dcc.Markdown(
+            """
+            Each assessment group can be broken down into its individual
+            assessments over the course of the semester. Feel free to use the 
+            second dropdown to explore each assessment group in depth. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_DETAILED_ASSESSMENT_GRADES_FIG)],
+            type="graph"
+        ),
+        dcc.Markdown(
+            """
+            As promised, here's a look at the trend of homework completion. As with 
+            projects, students tend to submit fewer assignments as the semester 
+            progresses. Though, I find it interesting that there are spikes in 
+            missing assignments at various points throughout the semester. I suspect 
+            that the assignments that students submit least often are tied to larger 
+            review assignments before exams.
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_MISSING_ASSESSMENT_FIG)],
+            type="graph"
+        ),
+        dcc.Markdown(
+            """
+            In addition, I find it helpful to look at average and median grades over
+            time. So, here's what that looks from semester to semester. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_ASSESSMENT_TRENDS_FIG)],
+            type="graph"
+        ),
+        dcc.Markdown(
+            """
+            The last few plots I'd like to sneak into this section actually 
+            integrates student reviews of the assessments. To start, here's a plot
+            of the time students claim they spend on each assessment. Depending on 
+            which filters you use, **this plot may show up empty**. I only started 
+            collecting time data for software 1 and 2. Future work will be done
+            to include exam time, since I now track that as well. 
+            """  
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_ASSESSMENT_GROUP_TIME_FIG)],
+            type="graph"
+        ),
+        html.P(
+            """
+            Up next, I want to share a more interesting plot I've crafted
+            that looks to combine the estimated time data with the median scores.
+            I call it the value plot because it shows the amount of percentage 
+            points a student can expect to get for an hour of their time. Again, 
+            if there is no time related data, you will not see a plot.
+            """  
+        ),
+         dcc.Loading(
+            [dcc.Graph(id=ID_VALUE_FIG)],
+            type="graph"
+        ),
+        html.H2("Assessment Breakdown"),
+        html.P(
+            """
+            Naturally, each assessment can be broken down into its individual 
+            submissions. At this level, we can take a look at assessment
+            distributions, which provide more context to the averages and medians.
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_GRADE_DISTRIBUTION_FIG)],
+            type="graph"
+        ),
+        html.P(
+            """
+            If you liked these plots, I'd encourage you to browse the triangulation
+            tab, which combines the grade data with some of the feedback I've gotten
+            over the years. 
+            """
         ),
-        color="dark",
-        dark=True,
-        sticky="top"
-    ),
-    html.H1("Assessment"),
-    html.P(
-        """
-        Since I began teaching in 2018, I've kept a lot of data about the
-        assessment of students. The goal of this page is to give you an overview 
-        of the way I've assessed students over the years. To browse a course, 
-        use the first dropdown at the top of the screen. All of the following 
-        plots will regenerate for you.  
-        """
-    ),
-    html.H2("Course Overview"),
-    html.P(
-        """
-        To kick things off, here's a plot of the average and median grades
-        grouped by assessment type (e.g., projects, homework, labs, etc.).
-        This should give you an overview of the types of assessments I've
-        used in my classes. Note: all of the assessments on this
-        page are averaged to include the missing assignments as well as all
-        submissions, which almost certainly lowers the overall averages.
-        Likewise, some averages, such as exams, are actually inflated due to 
-        grade replacement. Future work will be done to show this nuance in more 
-        detail.
-        """  
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_GRADE_OVERVIEW_FIG)],
-        type="graph"
-    ),
-    html.H2("Assessment Group Breakdown"),
-    dcc.Markdown(
-        """
-        Each assessment group can be broken down into its individual
-        assessments over the course of the semester. Feel free to use the 
-        second dropdown to explore each assessment group in depth. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_DETAILED_ASSESSMENT_GRADES_FIG)],
-        type="graph"
-    ),
-    dcc.Markdown(
-        """
-        As promised, here's a look at the trend of homework completion. As with 
-        projects, students tend to submit fewer assignments as the semester 
-        progresses. Though, I find it interesting that there are spikes in 
-        missing assignments at various points throughout the semester. I suspect 
-        that the assignments that students submit least often are tied to larger 
-        review assignments before exams.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_MISSING_ASSESSMENT_FIG)],
-        type="graph"
-    ),
-    dcc.Markdown(
-        """
-        In addition, I find it helpful to look at average and median grades over
-        time. So, here's what that looks from semester to semester. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_ASSESSMENT_TRENDS_FIG)],
-        type="graph"
-    ),
-    dcc.Markdown(
-        """
-        The last few plots I'd like to sneak into this section actually 
-        integrates student reviews of the assessments. To start, here's a plot
-        of the time students claim they spend on each assessment. Depending on 
-        which filters you use, **this plot may show up empty**. I only started 
-        collecting time data for software 1 and 2. Future work will be done
-        to include exam time, since I now track that as well. 
-        """  
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_ASSESSMENT_GROUP_TIME_FIG)],
-        type="graph"
-    ),
-    html.P(
-        """
-        Up next, I want to share a more interesting plot I've crafted
-        that looks to combine the estimated time data with the median scores.
-        I call it the value plot because it shows the amount of percentage 
-        points a student can expect to get for an hour of their time. Again, 
-        if there is no time related data, you will not see a plot.
-        """  
-    ),
-     dcc.Loading(
-        [dcc.Graph(id=ID_VALUE_FIG)],
-        type="graph"
-    ),
-    html.H2("Assessment Breakdown"),
-    html.P(
-        """
-        Naturally, each assessment can be broken down into its individual 
-        submissions. At this level, we can take a look at assessment
-        distributions, which provide more context to the averages and medians.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_GRADE_DISTRIBUTION_FIG)],
-        type="graph"
-    ),
-    html.P(
-        """
-        If you liked these plots, I'd encourage you to browse the triangulation
-        tab, which combines the grade data with some of the feedback I've gotten
-        over the years. 
-        """
-    ),
-    load_education_data(),
-    load_assignment_survey_data()
-])
+        load_education_data(),
+        load_assignment_survey_data(),
+        *([load_grade_rollups()] if CLIENTSIDE_FIGURES else [])
+    ])
@@ -1,14 +1,8 @@
-import string
-from collections import Counter
-from io import StringIO
-
 import dash
-import nltk
-import pandas as pd
 import plotly.graph_objects as go
 from dash import Input, Output, callback, dcc, html
-from nltk.corpus import stopwords
 
+from core.cache import cache_figure
 from core.constants import *
 from core.data import *
 
@@ -26,25 +20,21 @@ def create_course_eval_fig(course_eval_data, question, axes_labels):
     TODO: remove this at some point when we redo the site again
     """
     colors = dict(zip(axes_labels, COLORS_SATISFACTION.values()))
-    question_data = course_eval_data.melt(
-        id_vars=[item for item in course_eval_data.columns if question not in item],
-        var_name="Question",
-        value_name="Response"
-    )
-    question_data = question_data[question_data["Response"].notna()]
+    response_counts = resolve_rollup(course_eval_data, ID_RESPONSE_ROLLUP, question)
     question_fig = go.Figure(layout=dict(template='plotly'))
-    question_fig = px.histogram(
-        question_data,
-        x="Response",
-        color="Response",
-        facet_col="Question",
+    question_fig = px.bar(
+        response_counts,
+        x=COLUMN_RESPONSE,
+        y=COLUMN_COUNT,
+        color=COLUMN_RESPONSE,
+        facet_col=COLUMN_SUBQUESTION,
         facet_col_wrap=2,
-        category_orders=dict(Response=axes_labels),
+        category_orders={COLUMN_RESPONSE: axes_labels},
         text_auto=True,
         title=f"{question} by Subquestion".title(),
         color_discrete_map=colors
     )
-    question_fig.for_each_annotation(lambda a: a.update(text=a.text[a.text.find("[")+1:a.text.find("]")]))
+    question_fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
     return question_fig
 
 # Graph callbacks
@@ -53,9 +43,10 @@ def create_course_eval_fig(course_eval_data, question, axes_labels):
     Output(ID_SEI_RATINGS_FIG, "figure"),
     Input(ID_SEI_DATA, "data")
 )
+@cache_figure(ID_SEI_RATINGS_FIG)
 def render_sei_ratings_figure(
-    sei_ratings_history: str
-) -> go.Figure:
+    sei_ratings_history: dict
+) -> dict:
     """
     Creates an SEI data figure showing all of the SEI data results over "time", 
     where time is a categorical semester string that is added to the SEI data. 
@@ -65,15 +56,8 @@ def render_sei_ratings_figure(
     :param sei_ratings_history: the raw SEI data as a dataframe
     :return: the resulting SEI figure
     """
-    # Convert the data back into a dataframe
-    sei_ratings_df = pd.read_json(StringIO(sei_ratings_history))
-        
-    # Precompute columns 
-    sei_ratings_df[COLUMN_SEMESTER] = sei_ratings_df[COLUMN_SEMESTER_SEASON] + " " + sei_ratings_df[COLUMN_SEMESTER_YEAR].astype(str)
-    
-    # Prioritize maximum semesterly scores
-    sei_ratings_df = sei_ratings_df.iloc[sei_ratings_df.groupby([COLUMN_SEMESTER, COLUMN_QUESTION_ID, COLUMN_COHORT])[COLUMN_MEAN].agg(pd.Series.idxmax)]
-    sei_ratings_df = sei_ratings_df.sort_values(by=COLUMN_SEMESTER_ID)
+    # Look up the best scores per semester on the server
+    sei_ratings_df = resolve_rollup(sei_ratings_history, ID_SEI_SCORE_ROLLUP)
         
     # Plot figure
     sei_fig = go.Figure(layout=dict(template='plotly'))    
@@ -87,9 +71,9 @@ def render_sei_ratings_figure(
         markers=True, 
         title="Student Evaluation of Instruction Trends by Cohort",
         category_orders={
-            COLUMN_SEMESTER: SEMESTER_ORDER, 
+            COLUMN_SEMESTER: load_semester_order(), 
             COLUMN_COHORT: COHORT_ORDER,
-            COLUMN_QUESTION: QUESTION_ORDER
+            COLUMN_QUESTION: load_question_order()
         },
         height=800
     )
@@ -102,7 +86,8 @@ def render_sei_ratings_figure(
     Output(ID_SEI_COMMENTS_FIG, "figure"),
     Input(ID_SEI_COMMENTS_DATA, "data")
 )
-def render_sei_comments_figure(sei_comments_history: str):
+@cache_figure(ID_SEI_COMMENTS_FIG)
+def render_sei_comments_figure(sei_comments_history: dict):
     """
     Creates an SEI top words figure, which is generated from the comments
     data.
@@ -110,36 +95,9 @@ def render_sei_comments_figure(sei_comments_history: str):
     :param sei_comments_history: the SEI comments data
     :return: the resulting SEI comments figure
     """
-    # Convert the data back into a dataframe
-    sei_comments_df = pd.read_json(StringIO(sei_comments_history))
-    
-    # Installs needed corpus data
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except:
-        nltk.download('punkt')
-        
-    try:
-        nltk.data.find('corpora/stopwords')
-    except:
-        nltk.download('stopwords')
-    
-    # Tokenizes the comments and computes their counts
-    results = Counter()
-    sei_comments_df[COLUMN_COMMENT].str.lower().apply(nltk.word_tokenize).apply(results.update)
-    word_counts = pd.DataFrame.from_dict(results, orient="index").reset_index()
-    word_counts = word_counts.rename(columns={"index": COLUMN_WORD, 0: COLUMN_COUNT}) 
-    
-    # Removes stop words and punctuation from the totals
-    stop = stopwords.words("english")
-    word_counts = word_counts[~word_counts[COLUMN_WORD].isin(stop)]
-    word_counts = word_counts[~word_counts[COLUMN_WORD].isin(list(string.punctuation))]
-    word_counts = word_counts[~word_counts[COLUMN_WORD].str.contains("'")]
-    
-    # Sorts and pulls the top words
+    # Look up the top words in the term index on the server
     top_count = 40
-    word_counts = word_counts.sort_values(by=COLUMN_COUNT, ascending=False)
-    word_counts = word_counts.head(top_count)
+    word_counts = resolve_top_words(sei_comments_history, top_count)
     word_counts = word_counts.sort_values(by=COLUMN_COUNT)
     
     # Plot figure
@@ -159,124 +117,132 @@ def render_sei_comments_figure(sei_comments_history: str):
     Output(ID_EVAL_COURSE_CONTENT_FIG, "figure"),
     Input(ID_COURSE_EVAL_DATA, "data")
 )
-def render_course_content_figure(jsonified_data):
-    df = pd.read_json(StringIO(jsonified_data))
-    return create_course_eval_fig(df, "Course content", SCALE_LIKERT)
+@cache_figure(ID_EVAL_COURSE_CONTENT_FIG)
+def render_course_content_figure(course_eval_data):
+    return create_course_eval_fig(course_eval_data, "Course content", SCALE_LIKERT)
 
 
 @callback(
     Output(ID_EVAL_SKILL_FIG, "figure"),
     Input(ID_COURSE_EVAL_DATA, "data")
 )
-def render_skill_and_responsiveness_figure(jsonified_data):
-    df = pd.read_json(StringIO(jsonified_data))
-    return create_course_eval_fig(df, "Skill and responsiveness", SCALE_LIKERT)
+@cache_figure(ID_EVAL_SKILL_FIG)
+def render_skill_and_responsiveness_figure(course_eval_data):
+    return create_course_eval_fig(course_eval_data, "Skill and responsiveness", SCALE_LIKERT)
 
 
 @callback(
     Output(ID_EVAL_CONTRIBUTION_FIG, "figure"),
     Input(ID_COURSE_EVAL_DATA, "data")
 )
-def render_course_content_figure(jsonified_data):
-    df = pd.read_json(StringIO(jsonified_data))
+@cache_figure(ID_EVAL_CONTRIBUTION_FIG)
+def render_course_content_figure(course_eval_data):
     return create_course_eval_fig(
-        df,
+        course_eval_data,
         "Contribution to learning",
         SCALE_LIKERT_ALT
     )
 
 
-layout = html.Div([
-    html.H1("Feedback"),
-    html.P(
-        """
-        As an educator, I spend a lot of time assessing my students. 
-        Periodically, I give my students a chance to evaluate me. This page is 
-        reserved for all of the data related to student evaluations of me.
-        """
-    ),
-    html.H2("Student Evaluations of Instruction"),
-    dcc.Markdown(
-        """
-        Each semester, the university asks students to fill out a survey about 
-        the instruction for the course. These data are anonymized and provided 
-        as averages for each question. Here is the breakdown of my scores 
-        against the scores for various cohorts including my department, my 
-        college, and my university.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_SEI_RATINGS_FIG)],
-        type="graph"
-    ),
-    html.P(
-        """
-        Also, as a qualitative researcher, I find the comments themselves to be 
-        more meaningful. Therefore, here's a plot of the most frequent terms in 
-        my SEI comments. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_SEI_COMMENTS_FIG)],
-        type="graph"
-    ),
-    html.H2("Course Evaluation Survey Data"),
-    dcc.Markdown(
-        """
-        At the end of each semester, I ask students to give me feedback on the 
-        course. These data are collected through a Google Form. Questions are 
-        broken down into different areas which include feedback on course 
-        content, my skill and responsiveness, and the course's contribution to 
-        learning.
-        """
-    ),
-    html.H3('Course Content'),
-    html.P(
-        """
-        One way the course was evaluated was by asking students to rate their 
-        satisfaction with the course content. In short, there are four questions 
-        that I ask that cover topics that range from learning objectives to
-        organization. Generally, the students that choose to fill out the course 
-        survey seem to be satisfied with the course content. For example, at 
-        this time, there have been no "strongly disagree" responses. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_EVAL_COURSE_CONTENT_FIG)],
-        type="graph"
-    ),
-    html.H3("Skill and Responsiveness of the Instructor"),
-    html.P(
-        """
-        Another way the course was evaluated was by asking students to rate 
-        their satisfaction with the instructor, me. This time around, I ask six 
-        questions which range from satisfaction with time usage to satisfaction
-        with grading. Again, students are generally happy with my instruction. 
-        In fact, they're often more happy with my instruction than the course 
-        content itself. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_EVAL_SKILL_FIG)],
-        type="graph"
-    ),
-    html.H3("Contribution to Learning"),
-    dcc.Markdown(
-        """
-        Yet another way the course was evaluated was by asking students how much 
-        they felt the course contributed to their learning. In this section of 
-        the survey, I ask students four questions that attempt to chart how much
-        students felt they learned over the course of the semester. In general, 
-        students believe they learned a great deal, with most students reporting 
-        only a fair amount of knowledge coming into the course and a very good
-        amount of knowledge at the end of the course. 
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_EVAL_CONTRIBUTION_FIG)],
-        type="graph"
-    ),
-    load_sei_data(),
-    load_sei_comments_data(),
-    load_course_eval_data()
-])
+def layout(**kwargs) -> html.Div:
+    """
+    Builds the feedback page on every visit. The data is loaded on first use and 
+    reloaded whenever the underlying CSVs change, so nothing is loaded when 
+    the page is imported.
+
+    :return: the page layout
+    """
+    return html.Div([
+        html.H1("Feedback"),
+        html.P(
+            """
+            As an educator, I spend a lot of time assessing my students. 
+            Periodically, I give my students a chance to evaluate me. This page is 
+            reserved for all of the data related to student evaluations of me.
+            """
+        ),
+        html.H2("Student Evaluations of Instruction"),
+        dcc.Markdown(
+            """
+            Each semester, the university asks students to fill out a survey about 
+            the instruction for the course. These data are anonymized and provided 
+            as averages for each question. Here is the breakdown of my scores 
+            against the scores for various cohorts including my department, my 
+            college, and my university.
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_SEI_RATINGS_FIG)],
+            type="graph"
+        ),
+        html.P(
+            """
+            Also, as a qualitative researcher, I find the comments themselves to be 
+            more meaningful. Therefore, here's a plot of the most frequent terms in 
+            my SEI comments. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_SEI_COMMENTS_FIG)],
+            type="graph"
+        ),
+        html.H2("Course Evaluation Survey Data"),
+        dcc.Markdown(
+            """
+            At the end of each semester, I ask students to give me feedback on the 
+            course. These data are collected through a Google Form. Questions are 
+            broken down into different areas which include feedback on course 
+            content, my skill and responsiveness, and the course's contribution to 
+            learning.
+            """
+        ),
+        html.H3('Course Content'),
+        html.P(
+            """
+            One way the course was evaluated was by asking students to rate their 
+            satisfaction with the course content. In short, there are four questions 
+            that I ask that cover topics that range from learning objectives to
+            organization. Generally, the students that choose to fill out the course 
+            survey seem to be satisfied with the course content. For example, at 
+            this time, there have been no "strongly disagree" responses. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_EVAL_COURSE_CONTENT_FIG)],
+            type="graph"
+        ),
+        html.H3("Skill and Responsiveness of the Instructor"),
+        html.P(
+            """
+            Another way the course was evaluated was by asking students to rate 
+            their satisfaction with the instructor, me. This time around, I ask six 
+            questions which range from satisfaction with time usage to satisfaction
+            with grading. Again, students are generally happy with my instruction. 
+            In fact, they're often more happy with my instruction than the course 
+            content itself. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_EVAL_SKILL_FIG)],
+            type="graph"
+        ),
+        html.H3("Contribution to Learning"),
+        dcc.Markdown(
+            """
+            Yet another way the course was evaluated was by asking students how much 
+            they felt the course contributed to their learning. In this section of 
+            the survey, I ask students four questions that attempt to chart how much
+            students felt they learned over the course of the semester. In general, 
+            students believe they learned a great deal, with most students reporting 
+            only a fair amount of knowledge coming into the course and a very good
+            amount of knowledge at the end of the course. 
+            """
+        ),
+        dcc.Loading(
+            [dcc.Graph(id=ID_EVAL_CONTRIBUTION_FIG)],
+            type="graph"
+        ),
+        load_sei_data(),
+        load_sei_comments_data(),
+        load_course_eval_data()
+    ])
@@ -1,10 +1,10 @@
-from io import StringIO
+import functools
 
 import dash
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Input, Output, callback, dcc, html
+from dash import dcc, html
 
 from core.constants import *
 from core.data import *
@@ -16,21 +16,15 @@ dash.register_page(
     title=HISTORY_PAGE_TITLE
 )
 
-# Graph callbacks
+# Graph renders
 
-@callback(
-    Output(ID_COURSE_HISTORY_LIST, "children"),
-    Input(ID_HISTORY_DATA, "data")
-)
-def render_course_history_list(history_data: str) -> list[html.Li]:
+def render_course_history_list(history_df: pd.DataFrame) -> list[html.Li]:
     """
     Creates a list of all the courses I've taught with key information.
 
-    :param history_data: the jsonified teaching history
+    :param history_df: the teaching history
     :return: a list of list item objects
     """
-    history_df = pd.read_json(StringIO(history_data))
-
     list_items = []
     course_ids = history_df[COLUMN_COURSE_ID].unique()
     course_ids.sort()
@@ -50,18 +44,13 @@ def render_course_history_list(history_data: str) -> list[html.Li]:
     return list_items
 
 
-@callback(
-    Output(ID_TIME_COUNTS_FIG, "figure"),
-    Input(ID_HISTORY_DATA, "data")
-)
-def render_time_counts_fig(history_data: str) -> go.Figure:
+def render_time_counts_fig(history_df: pd.DataFrame) -> go.Figure:
     """
     Creates a figure of the most common section times in my teaching history.
 
-    :param history_data: the jsonified teaching history
+    :param history_df: the teaching history
     :return: a bar graph
     """
-    history_df = pd.read_json(StringIO(history_data))
     history_df = history_df[history_df[COLUMN_COURSE_TYPE] == "Lecture"]
     history_df = history_df.sort_values(by=COLUMN_SECTION_START_TIME)
     
@@ -85,20 +74,15 @@ def render_time_counts_fig(history_data: str) -> go.Figure:
     return time_counts_fig
 
 
-@callback(
-    Output(ID_ROOM_COUNTS_FIG, "figure"),
-    Input(ID_HISTORY_DATA, "data")
-)
-def render_room_counts_fig(history_data: str) -> go.Figure:
+def render_room_counts_fig(history_df: pd.DataFrame) -> go.Figure:
     """
     Creates a figure of the most common classrooms in my teaching history.
 
-    :param history_data: the jsonified teaching history
+    :param history_df: the teaching history
     :return: a bar graph
     """
-    history_df = pd.read_json(StringIO(history_data))
     history_df = history_df[history_df[COLUMN_COURSE_TYPE] == "Lecture"]
-    history_df[COLUMN_CLASSROOM] = history_df[COLUMN_SECTION_BUILDING] + " " + history_df[COLUMN_SECTION_ROOM_NUMBER]
+    history_df[COLUMN_CLASSROOM] = history_df[COLUMN_SECTION_BUILDING].astype(str) + " " + history_df[COLUMN_SECTION_ROOM_NUMBER]
     history_df = history_df.sort_values(by=COLUMN_CLASSROOM)
 
     room_counts_fig = go.Figure(layout=dict(template='plotly'))
@@ -121,18 +105,13 @@ def render_room_counts_fig(history_data: str) -> go.Figure:
     return room_counts_fig
 
 
-@callback(
-    Output(ID_STUDENT_COUNTS_FIG, "figure"),
-    Input(ID_HISTORY_DATA, "data")
-)
-def render_cumulative_enrollment_fig(history_data: str) -> go.Figure:
+def render_cumulative_enrollment_fig(history_df: pd.DataFrame) -> go.Figure:
     """
     Creates a figure of the number of students I've acummulated over time.
 
-    :param history_data: the jsonified teaching history
+    :param history_df: the teaching history
     :return: a bar graph
     """
-    history_df = pd.read_json(StringIO(history_data))
     history_df = history_df[history_df[COLUMN_COURSE_TYPE] == "Lecture"]
     history_df[COLUMN_SEMESTER] = history_df[COLUMN_SEMESTER_SEASON] + " " + history_df[COLUMN_SEMESTER_YEAR].astype(str)
     history_df = history_df.groupby(COLUMN_SEMESTER).agg({
@@ -154,132 +133,153 @@ def render_cumulative_enrollment_fig(history_data: str) -> go.Figure:
     return time_counts_fig
 
 
-layout = html.Div([
-    html.H1("History"),
-    html.P(
-        """
-        To help track my progress as an educator and provide some level of 
-        transparency around the development of my courses, I've created this 
-        history document. It details my teaching history and all of the things
-        I've changed over time. 
-        """
-    ),
-    html.P(
-        """
-        Since 2018, I've taught in various capacities. For example, the
-        following list details all of the courses I've taught.
-        """
-    ),
-    html.Ul(id=ID_COURSE_HISTORY_LIST),
-    html.P(
-        """
-        At this point in my career, I've taught many students. To get a feel for
-        just how many, I've plotted the cumulative number of students
-        over time below.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_STUDENT_COUNTS_FIG)],
-        type="graph"
-    ),
-    html.P(
-        """
-        On the remainder of this page, I'll share some interesting visualizations
-        of my teaching history.
-        """
-    ),
-    html.H2("Schedule Prediction"),
-    html.P(
-        """
-        Every semester I get a wave of students asking me when I'll be teaching
-        in the future. Because I have very little say in my schedule, I almost
-        never know what my future schedule is going to look like until a week
-        or two before each semester. However, I thought it would be interesting
-        to look at my most common teaching times and rooms to see if I can
-        better help students predict my future schedule. To start, here's a
-        distribution of course times.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_TIME_COUNTS_FIG)],
-        type="graph"
-    ),
-    html.P(
-        """
-        Similarly, here's the distribution of classrooms that I've lectured in.
-        """
-    ),
-    dcc.Loading(
-        [dcc.Graph(id=ID_ROOM_COUNTS_FIG)],
-        type="graph"
-    ),
-    html.H2("Course Changes"),
-    html.P(
-        """
-        The last thing I'd like to document on this page is a list of changes
-        I've made to my courses over the years. 
-        """
-    ),
-    dcc.Markdown(
-        """
-        - Autumn 2025
-            - Reworked exams to pull from learning objective-based question banks
-            - Wrote a unified study guide that shares all learning objectives for all exams
-        - Spring 2025
-            - Added Carmen rubrics to portfolio project assignments
-            - Fixed up Carmen automation script
-            - Converted git usage over to GitHub Desktop
-        - Autumn 2024
-            - Experimented with no deadlines on assignments
-            - Full launched VSCode and Git as classroom tools
-        - Summer 2024
-            - Overhauled dashboard to make use of pages and dropdowns
-            - Added information about teaching history, which includes a few plots to help students predict my schedule
-            - Updated grade data in dashboard to include all submissions, not just the final grades
-            - Automated course data pulling from Canvas API
-        - Spring 2024
-            - Started tracking patch notes
-            - Drafted and piloted a VSCode monorepo for software 2
-            - Updated dashboard to include software 2 statistics
-            - Created slides for all lectures of software 2
-            - Reworked site to make use of structured data files
-        - Autumn 2023
-            - Started teaching software 2 (CSE 2231)
-            - Created checklists for all 10 projects in software 2
-            - Created rubrics for all 10 projects in software 2
-            - Piloted a portfolio project in software 2 where students create their own OSU component
-            - Offered the portfolio project as a midterm exam replacement option
-            - Converted exams to online format using Carmen quizzes
-            - Extended duration of exams from 55 minutes to 80 minutes
-        - Summer 2023
-            - Trained to teach software 2 (CSE 2231)
-            - Create homework solutions for all 10 projects in software 2
-        - Spring 2023
-            - Started allowing students in software 1 to resubmit projects after making corrections
-            - Created checklists for all 11 projects in software 1
-        - Spring 2022
-            - Created checklists for all 11 projects in software 1
-        - Autumn 2021
-            - Created rubrics for all 11 projects in software 1
-            - Started creating homework solutions for software 1
-        - Spring 2020
-            - Held a Small Group Instructional Diagnostic (SGID) with my software 1 class
-            - Completed a portion of the semester online due to COVID
-        - Autumn 2019
-            - Started teaching software 1 (CSE 2221)
-            - Administered grading guidelines to teaching assistants only
-        - Summer 2019
-            - Trained to teach software 1 (CSE 2221)
-        - Autumn 2018
-            - Started teaching introduction to Java (CSE 1223)
-            - Learned to always ask students to request extensions in writing
-        """
-    ),
-    html.P(
-        """
-        And, there you have it! I'll continue to update this site as I always
-        do to show my dedication to education over time. 
-        """
-    ),
-    load_teaching_history()
-])
+@functools.lru_cache(maxsize=DATASET_VERSIONS_KEPT)
+def prerender_history(version: str) -> dict:
+    """
+    Renders the course list and every figure on the history page for a
+    single version of the teaching history. Nothing on this page depends
+    on user input, so the results are embedded directly in the layout
+    and reused on every visit until the data changes.
+
+    :param version: the teaching history version
+    :return: a dictionary of rendered components keyed by component ID
+    """
+    history_df = resolve_dataset({"id": ID_HISTORY_DATA, "version": version})
+    return {
+        ID_COURSE_HISTORY_LIST: render_course_history_list(history_df),
+        ID_STUDENT_COUNTS_FIG: render_cumulative_enrollment_fig(history_df).to_plotly_json(),
+        ID_TIME_COUNTS_FIG: render_time_counts_fig(history_df).to_plotly_json(),
+        ID_ROOM_COUNTS_FIG: render_room_counts_fig(history_df).to_plotly_json()
+    }
+
+
+def layout(**kwargs) -> html.Div:
+    """
+    Builds the history page on every visit. The data is loaded on first use and 
+    reloaded whenever the underlying CSVs change, so nothing is loaded when 
+    the page is imported. The course list and figures are pre-rendered once
+    per data version, so the page needs no callbacks.
+
+    :return: the page layout
+    """
+    history_data = load_teaching_history().data
+    rendered = prerender_history(history_data["version"])
+    return html.Div([
+        html.H1("History"),
+        html.P(
+            """
+            To help track my progress as an educator and provide some level of 
+            transparency around the development of my courses, I've created this 
+            history document. It details my teaching history and all of the things
+            I've changed over time. 
+            """
+        ),
+        html.P(
+            """
+            Since 2018, I've taught in various capacities. For example, the
+            following list details all of the courses I've taught.
+            """
+        ),
+        html.Ul(rendered[ID_COURSE_HISTORY_LIST], id=ID_COURSE_HISTORY_LIST),
+        html.P(
+            """
+            At this point in my career, I've taught many students. To get a feel for
+            just how many, I've plotted the cumulative number of students
+            over time below.
+            """
+        ),
+        dcc.Graph(id=ID_STUDENT_COUNTS_FIG, figure=rendered[ID_STUDENT_COUNTS_FIG]),
+        html.P(
+            """
+            On the remainder of this page, I'll share some interesting visualizations
+            of my teaching history.
+            """
+        ),
+        html.H2("Schedule Prediction"),
+        html.P(
+            """
+            Every semester I get a wave of students asking me when I'll be teaching
+            in the future. Because I have very little say in my schedule, I almost
+            never know what my future schedule is going to look like until a week
+            or two before each semester. However, I thought it would be interesting
+            to look at my most common teaching times and rooms to see if I can
+            better help students predict my future schedule. To start, here's a
+            distribution of course times.
+            """
+        ),
+        dcc.Graph(id=ID_TIME_COUNTS_FIG, figure=rendered[ID_TIME_COUNTS_FIG]),
+        html.P(
+            """
+            Similarly, here's the distribution of classrooms that I've lectured in.
+            """
+        ),
+        dcc.Graph(id=ID_ROOM_COUNTS_FIG, figure=rendered[ID_ROOM_COUNTS_FIG]),
+        html.H2("Course Changes"),
+        html.P(
+            """
+            The last thing I'd like to document on this page is a list of changes
+            I've made to my courses over the years. 
+            """
+        ),
+        dcc.Markdown(
+            """
+            - Autumn 2025
+                - Reworked exams to pull from learning objective-based question banks
+                - Wrote a unified study guide that shares all learning objectives for all exams
+            - Spring 2025
+                - Added Carmen rubrics to portfolio project assignments
+                - Fixed up Carmen automation script
+                - Converted git usage over to GitHub Desktop
+            - Autumn 2024
+                - Experimented with no deadlines on assignments
+                - Full launched VSCode and Git as classroom tools
+            - Summer 2024
+                - Overhauled dashboard to make use of pages and dropdowns
+                - Added information about teaching history, which includes a few plots to help students predict my schedule
+                - Updated grade data in dashboard to include all submissions, not just the final grades
+                - Automated course data pulling from Canvas API
+            - Spring 2024
+                - Started tracking patch notes
+                - Drafted and piloted a VSCode monorepo for software 2
+                - Updated dashboard to include software 2 statistics
+                - Created slides for all lectures of software 2
+                - Reworked site to make use of structured data files
+            - Autumn 2023
+                - Started teaching software 2 (CSE 2231)
+                - Created checklists for all 10 projects in software 2
+                - Created rubrics for all 10 projects in software 2
+                - Piloted a portfolio project in software 2 where students create their own OSU component
+                - Offered the portfolio project as a midterm exam replacement option
+                - Converted exams to online format using Carmen quizzes
+                - Extended duration of exams from 55 minutes to 80 minutes
+            - Summer 2023
+                - Trained to teach software 2 (CSE 2231)
+                - Create homework solutions for all 10 projects in software 2
+            - Spring 2023
+                - Started allowing students in software 1 to resubmit projects after making corrections
+                - Created checklists for all 11 projects in software 1
+            - Spring 2022
+                - Created checklists for all 11 projects in software 1
+            - Autumn 2021
+                - Created rubrics for all 11 projects in software 1
+                - Started creating homework solutions for software 1
+            - Spring 2020
+                - Held a Small Group Instructional Diagnostic (SGID) with my software 1 class
+                - Completed a portion of the semester online due to COVID
+            - Autumn 2019
+                - Started teaching software 1 (CSE 2221)
+                - Administered grading guidelines to teaching assistants only
+            - Summer 2019
+                - Trained to teach software 1 (CSE 2221)
+            - Autumn 2018
+                - Started teaching introduction to Java (CSE 1223)
+                - Learned to always ask students to request extensions in writing
+            """
+        ),
+        html.P(
+            """
+            And, there you have it! I'll continue to update this site as I always
+            do to show my dedication to education over time. 
+            """
+        )
+    ])